@@ -7,7 +7,7 @@ from datetime import datetime
 
 from .base_agent import BaseAgent, AgentInput
 from services.document_ai_service import DocumentAIService
-from services.firestore_service import FirestoreService
+from core.clients import get_firestore
 from models.user import UserProfile, UserProfileCreate
 
 
@@ -20,7 +20,7 @@ class ProfileAgent(BaseAgent):
             description="Processes user profiles, validates data, and extracts information from resumes"
         )
         self.document_ai = DocumentAIService()
-        self.firestore = FirestoreService()
+        self.firestore = get_firestore()
     
     async def _process(self, input_data: AgentInput) -> Dict[str, Any]:
         """Process user profile data and resume information."""
@@ -3,11 +3,12 @@
 Exposes:
 - POST /api/profile -> profiles.create_profile
 - POST /api/resume -> profiles.upload_resume
+- GET /api/resume -> profiles.get_parsed_resume
 - GET /api/recommendations -> careers.get_career_recommendations
 - POST /api/chat -> chat.send_message (unauth fallback to /chat/test if no token)
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Request
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, UploadFile, File, Request
 from fastapi.security import HTTPBearer
 from typing import Optional, Dict, Any
 import logging
@@ -19,7 +20,6 @@ from . import chat as chat_mod
 from core.security import verify_token
 from pydantic import BaseModel, RootModel
 from data.domains_roadmap import DOMAINS_ROADMAP
-from services.firestore_service import FirestoreService
 import re
 
 logger = logging.getLogger(__name__)
@@ -83,8 +83,15 @@ async def parse_resume(request: Request, file: UploadFile = File(...), token = D
     raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Unauthorized")
 
 
+@router.get("/resume")
+async def get_parsed_resume(token = Depends(security)):
+    if token and token.credentials:
+        return await profiles_mod.get_parsed_resume(token=token)
+    raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Unauthorized")
+
+
 @router.get("/recommendations")
-async def recommendations(token = Depends(security)):
+async def recommendations(background_tasks: BackgroundTasks, token = Depends(security)):
     """
     Return role-based career recommendations (array) for the sidebar and dashboard.
     Uses the careers module so titles like "Software Developer"/"Data Analyst" appear,
@@ -95,7 +102,7 @@ async def recommendations(token = Depends(security)):
 
     try:
         # Delegate to careers module which already reads the profile and computes matches
-        reco = await careers_mod.get_career_recommendations(token=token)
+        reco = await careers_mod.get_career_recommendations(background_tasks, token=token)
         # careers_mod.get_career_recommendations returns a CareerRecommendation model or dict
         # Normalize to an array for the frontend client
         if isinstance(reco, dict):
@@ -121,6 +128,6 @@ async def career_trends():
 @router.post("/chat")
 async def chat(payload: ChatPayload, token = Depends(security)):
     if token and token.credentials:
-        return await chat_mod.send_message(chat_mod.ChatRequest(**payload.dict()), token=token)
+        return await chat_mod.send_message(chat_mod.ChatRequest(**payload.model_dump()), token=token)
     # if no token, allow test endpoint for UX during unauth
-    return await chat_mod.test_chat(chat_mod.ChatRequest(**payload.dict()))
+    return await chat_mod.test_chat(chat_mod.ChatRequest(**payload.model_dump()))
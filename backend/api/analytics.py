@@ -7,7 +7,7 @@ from typing import Dict, Any, List, Optional
 import logging
 
 from core.security import verify_token
-from services.firestore_service import FirestoreService
+from core.clients import get_firestore
 from services.bigquery_service_mock import BigQueryService
 from services.market_trends_service import market_trends_service
 
@@ -15,7 +15,7 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 security = HTTPBearer()
 
-firestore_service = FirestoreService()
+firestore_service = get_firestore()
 bigquery_service = BigQueryService()
 
 
@@ -8,14 +8,14 @@ import logging
 
 from models.user import UserCreate, User, Token
 from core.security import create_access_token, verify_token
-from services.firestore_service import FirestoreService
+from core.clients import get_firestore
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 security = HTTPBearer()
 
 # Initialize services
-firestore_service = FirestoreService()
+firestore_service = get_firestore()
 
 
 class LoginRequest(BaseModel):
@@ -1,18 +1,25 @@
 """Career API endpoints for career matching and recommendations."""
 
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Depends, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from fastapi.security import HTTPBearer
 from pydantic import BaseModel
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterator, Tuple
+from functools import lru_cache
+import asyncio
 import logging
-from datetime import datetime
+import orjson
 
 from models.career import (
     Career, CareerMatch, CareerRecommendation,
     Job, JobSearchRequest, JobSearchResponse
 )
+from core.config import settings
 from core.security import verify_token
-from services.firestore_service import FirestoreService
+from core.background import save_in_background
+from core.clock import utc_now_iso
+from core.clients import get_firestore, get_gemini_generator
 from services.job_scraper_service import job_scraper_service
 from agents.base_agent import orchestrator, AgentInput
 
@@ -20,7 +27,11 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 security = HTTPBearer()
 
-firestore_service = FirestoreService()
+firestore_service = get_firestore()
+
+# Bounds in-flight Gemini generations so a burst of requests queues here instead of
+# piling up against the API quota
+_gemini_semaphore = asyncio.Semaphore(max(1, settings.GEMINI_MAX_CONCURRENCY))
 
 
 class CareerSearchRequest(BaseModel):
@@ -33,7 +44,11 @@ class CareerSearchRequest(BaseModel):
 
 @router.post("/search", response_model=List[CareerMatch])
 async def search_careers(request: CareerSearchRequest, token: str = Depends(security)):
-    """Search for careers based on user criteria."""
+    """Search for careers based on user criteria.
+    
+    Matches come from our own agent or mock fixtures, so they are encoded straight to an
+    ORJSONResponse; ``response_model`` is kept for the OpenAPI schema only.
+    """
     try:
         payload = verify_token(token.credentials)
         user_id = payload.get("user_id")
@@ -59,15 +74,15 @@ async def search_careers(request: CareerSearchRequest, token: str = Depends(secu
             data=search_data
         )
         
-        if "career_match_agent" in orchestrator.agents:
-            result = await orchestrator.agents["career_match_agent"].execute(agent_input)
+        if (agent := orchestrator.agents.get("career_match_agent")) is not None:
+            result = await agent.execute(agent_input)
             
             if result.success:
                 career_matches = result.result.get("career_matches", [])
-                return career_matches
+                return ORJSONResponse(content=jsonable_encoder(career_matches, exclude_none=True))
         
         # Fallback mock data
-        return _get_mock_career_matches()
+        return ORJSONResponse(content=jsonable_encoder(_get_mock_career_matches(), exclude_none=True))
         
     except Exception as e:
         logger.error(f"Career search failed: {e}")
@@ -77,8 +92,8 @@ async def search_careers(request: CareerSearchRequest, token: str = Depends(secu
         )
 
 
-@router.post("/recommend", response_model=CareerRecommendation)
-async def get_career_recommendations(token: str = Depends(security)):
+@router.post("/recommend", response_model=CareerRecommendation, response_model_exclude_none=True)
+async def get_career_recommendations(background_tasks: BackgroundTasks, token: str = Depends(security)):
     """Get personalized career recommendations for the user."""
     try:
         payload = verify_token(token.credentials)
@@ -98,8 +113,8 @@ async def get_career_recommendations(token: str = Depends(security)):
             data={"user_profile": user_profile}
         )
         
-        if "career_match_agent" in orchestrator.agents:
-            result = await orchestrator.agents["career_match_agent"].execute(agent_input)
+        if (agent := orchestrator.agents.get("career_match_agent")) is not None:
+            result = await agent.execute(agent_input)
             
             if result.success:
                 career_matches = result.result.get("career_matches", [])
@@ -108,13 +123,17 @@ async def get_career_recommendations(token: str = Depends(security)):
                 recommendation = CareerRecommendation(
                     user_id=user_id,
                     recommended_careers=career_matches,
-                    generated_at="2024-01-01T00:00:00",
+                    generated_at=utc_now_iso(),
                     confidence_score=confidence_scores.get("overall", 0.8) * 100,
                     methodology=result.result.get("matching_methodology", "AI-powered matching")
                 )
                 
-                # Save recommendation
-                await firestore_service.save_career_recommendation(user_id, recommendation.dict())
+                # Persist after the response is sent; the caller doesn't need the record id
+                background_tasks.add_task(
+                    save_in_background, "career recommendation",
+                    firestore_service.save_career_recommendation,
+                    user_id, recommendation.model_dump(mode="json", exclude_none=True)
+                )
                 
                 return recommendation
         
@@ -277,7 +296,8 @@ async def get_career_details(career_id: str):
 
 
 @router.post("/{career_id}/personalized-path")
-async def generate_personalized_path(career_id: str, token: str = Depends(security)):
+async def generate_personalized_path(career_id: str, background_tasks: BackgroundTasks,
+                                     token: str = Depends(security)):
     """Generate a personalized learning path for a specific career using AI."""
     try:
         payload = verify_token(token.credentials)
@@ -322,8 +342,7 @@ async def generate_personalized_path(career_id: str, token: str = Depends(securi
             )
         
         # Use Gemini to generate personalized path
-        from services.gemini_service import GeminiService
-        gemini = GeminiService()
+        gemini = get_gemini_generator()
         
         user_skills = user_profile.get("skills", [])
         user_interests = user_profile.get("interests", [])
@@ -406,7 +425,18 @@ Please provide a JSON response with the following structure:
 
 Provide real, actionable recommendations with actual course links (Coursera, Udemy, freeCodeCamp, etc.) where applicable."""
 
-        response = await gemini._generate_text(prompt)
+        try:
+            async with _gemini_semaphore:
+                response = await asyncio.wait_for(
+                    gemini._generate_text(prompt),
+                    timeout=settings.GEMINI_TIMEOUT_SECONDS,
+                )
+        except asyncio.TimeoutError:
+            logger.warning(f"Personalized path generation timed out for user {user_id}, career {career_id}")
+            raise HTTPException(
+                status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+                detail="Personalized path generation timed out, please try again"
+            )
         
         # Parse JSON response
         import json
@@ -444,13 +474,18 @@ Provide real, actionable recommendations with actual course links (Coursera, Ude
         
         logger.info(f"Generated personalized path for user {user_id} and career {career_id}")
         
-        return {
+        result = {
             "career_id": career_id,
             "career_title": career_title,
             "user_id": user_id,
-            "generated_at": datetime.utcnow().isoformat(),
+            "generated_at": utc_now_iso(),
             **personalized_path
         }
+        background_tasks.add_task(
+            save_in_background, "personalized path",
+            firestore_service.save_personalized_path, user_id, career_id, result
+        )
+        return result
         
     except HTTPException:
         raise
@@ -502,7 +537,7 @@ async def search_jobs(request: JobSearchRequest, token: str = Depends(security))
             total_count=len(jobs),
             search_term=request.search_term,
             location=request.location,
-            timestamp=datetime.utcnow()
+            timestamp=utc_now_iso()
         )
         
         logger.info(f"Found {len(jobs)} jobs for user {user_id}")
@@ -517,10 +552,48 @@ async def search_jobs(request: JobSearchRequest, token: str = Depends(security))
         )
 
 
-def _get_mock_career_matches() -> List[CareerMatch]:
-    """Return mock career matches for development."""
-    from models.career import Career, CareerMatch
+
+@router.post("/jobs/search/stream")
+async def search_jobs_stream(request: JobSearchRequest, token: str = Depends(security)):
+    """
+    Stream real job listings as NDJSON (one JSON job object per line).
     
+    Same search as ``/jobs/search``, but each job is written to the client as soon as
+    it is formatted instead of building the whole ``JobSearchResponse`` first.
+    """
+    payload = verify_token(token.credentials)
+    user_id = payload.get("user_id")
+    
+    logger.info("User %s streaming jobs: %s in %s", user_id, request.search_term, request.location)
+    
+    def ndjson_lines() -> Iterator[bytes]:
+        # Sync generator: Starlette drives it from a worker thread, so the blocking
+        # scrape does not stall the event loop.
+        count = 0
+        try:
+            for job_data in job_scraper_service.iter_scrape_jobs(
+                search_term=request.search_term,
+                location=request.location,
+                results_wanted=request.results_wanted,
+                hours_old=request.hours_old,
+                country_indeed=request.country_indeed,
+                google_search_term=request.google_search_term,
+                site_name=request.site_name,
+                linkedin_fetch_description=request.linkedin_fetch_description
+            ):
+                yield orjson.dumps(job_data) + b"\n"
+                count += 1
+        except Exception as e:
+            # Headers are already sent; end the stream and log the failure
+            logger.error("Job search stream failed: %s", e)
+        logger.info("Streamed %d jobs for user %s", count, user_id)
+    
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+
+
+@lru_cache(maxsize=1)
+def _mock_career_matches() -> Tuple[CareerMatch, ...]:
+    """Build the immutable mock career match fixture once, on first use."""
     mock_career = Career(
         id="sw-dev-001",
         title="Software Developer",
@@ -548,17 +621,21 @@ def _get_mock_career_matches() -> List[CareerMatch]:
         recommendation_reason="Strong programming foundation with good growth potential"
     )
     
-    return [match]
+    return (match,)
+
+
+def _get_mock_career_matches() -> List[CareerMatch]:
+    """Return mock career matches for development."""
+    return list(_mock_career_matches())
 
 
 def _get_mock_career_recommendation(user_id: str) -> CareerRecommendation:
     """Return mock career recommendation for development."""
-    career_matches = _get_mock_career_matches()
-    
+    # Nested CareerMatch instances are reused as-is; pydantic does not revalidate them
     return CareerRecommendation(
         user_id=user_id,
-        recommended_careers=career_matches,
-        generated_at="2024-01-01T00:00:00",
+        recommended_careers=_get_mock_career_matches(),
+        generated_at=utc_now_iso(),
         confidence_score=85.0,
         methodology="AI-powered matching algorithm"
-    )
\ No newline at end of file
+    )
@@ -1,16 +1,21 @@
 """Chat API endpoints for AI-powered conversations."""
 
 from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi.responses import StreamingResponse
 from fastapi.security import HTTPBearer
 from pydantic import BaseModel
-from typing import List, Optional, Dict, Any
+from functools import lru_cache
+from types import MappingProxyType
+from typing import List, Optional, Dict, Any, Final, FrozenSet, Tuple
 import logging
 import asyncio
+import re
+import orjson
+from datetime import datetime, timezone
 
 from models.chat import ChatMessage, ChatMessageCreate, ChatSession, ChatResponse
 from core.security import verify_token
-from services.firestore_service import FirestoreService
-from services.gemini_service_real import GeminiService
+from core.clients import get_firestore, get_gemini
 from agents.base_agent import orchestrator, AgentInput
 
 logger = logging.getLogger(__name__)
@@ -18,8 +23,67 @@ router = APIRouter()
 security = HTTPBearer()
 
 # Initialize services
-firestore_service = FirestoreService()
-gemini_service = GeminiService()
+firestore_service = get_firestore()
+gemini_service = get_gemini()
+
+
+_DEFAULT_SYSTEM_PROMPT: Final = (
+    "You are an AI career advisor for Indian students. Provide helpful, practical career guidance."
+)
+# Upper bound on prior-message characters sent to Gemini with each turn
+_HISTORY_CHAR_BUDGET: Final = 2000
+_PROFILE_CONTEXT_FOOTER: Final = (
+    "\n\nUse this information to provide personalized career advice relevant to their background and goals."
+)
+
+# Strong references to fire-and-forget tasks so they aren't collected mid-flight
+_background_tasks: set = set()
+
+
+def _spawn(coro) -> None:
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+# Keyword families (substring matches on the lowercased message). Add keywords here;
+# the scanner below is rebuilt from these at import.
+_SUGGESTION_KEYWORDS = MappingProxyType({
+    "career": ("career", "job", "profession"),
+    "skill": ("skill", "learn", "course"),
+    "salary": ("salary", "money", "pay"),
+})
+_INTENT_KEYWORDS = MappingProxyType({
+    "career_exploration": ("career", "job", "profession", "work"),
+    "skill_development": ("skill", "learn", "study", "course"),
+    "salary_inquiry": ("salary", "money", "pay", "income"),
+})
+
+
+def _build_keyword_tags() -> Dict[str, FrozenSet[Tuple[str, str]]]:
+    tags: Dict[str, set] = {}
+    for family, groups in (("suggest", _SUGGESTION_KEYWORDS), ("intent", _INTENT_KEYWORDS)):
+        for category, words in groups.items():
+            for word in words:
+                tags.setdefault(word, set()).add((family, category))
+    return {word: frozenset(t) for word, t in tags.items()}
+
+
+_KEYWORD_TAGS = _build_keyword_tags()
+# Zero-width lookahead so overlapping keywords ("pay" inside "payroll") all match in one pass
+_KEYWORD_RE = re.compile(
+    "(?=(" + "|".join(re.escape(w) for w in sorted(_KEYWORD_TAGS, key=len, reverse=True)) + "))"
+)
+
+
+@lru_cache(maxsize=4096)
+def _scan_keywords(message_lower: str) -> FrozenSet[Tuple[str, str]]:
+    """Return every (family, category) tag whose keyword occurs in the message.
+
+    Cached on the normalized message; short prompts like "what should I learn" repeat a lot.
+    """
+    found = {m.group(1) for m in _KEYWORD_RE.finditer(message_lower)}
+    return frozenset().union(*(_KEYWORD_TAGS[w] for w in found)) if found else frozenset()
 
 
 class ChatRequest(BaseModel):
@@ -35,14 +99,18 @@ async def create_chat_session(token: str = Depends(security)):
         user_id = payload.get("user_id")
         
         session_id = await firestore_service.create_chat_session(user_id)
+        now = datetime.now(timezone.utc)
+        
+        # The first message of the session usually follows shortly; get the connection ready
+        _spawn(gemini_service.warmup())
         
         # Get session data
         session_data = {
             "id": session_id,
             "user_id": user_id,
             "title": f"Chat Session {session_id[:8]}",
-            "created_at": "2024-01-01T00:00:00",
-            "updated_at": "2024-01-01T00:00:00",
+            "created_at": now,
+            "updated_at": now,
             "is_active": True,
             "message_count": 0
         }
@@ -66,12 +134,8 @@ async def get_user_sessions(token: str = Depends(security)):
         
         sessions_data = await firestore_service.get_user_sessions(user_id)
         
-        sessions = []
-        for session_data in sessions_data:
-            session = ChatSession(**session_data)
-            sessions.append(session)
-        
-        return sessions
+        # Rows were validated when written; skip re-validating each one on the way out
+        return [ChatSession.model_construct(**session_data) for session_data in sessions_data]
         
     except Exception as e:
         logger.error(f"Failed to get user sessions: {e}")
@@ -88,18 +152,11 @@ async def get_chat_history(session_id: str, token: str = Depends(security)):
         payload = verify_token(token.credentials)
         user_id = payload.get("user_id")
         
-        messages_data = await firestore_service.get_chat_history(session_id)
-        
-        messages = []
-        for msg_data in messages_data:
-            # Verify user owns this session
-            if msg_data.get("user_id") != user_id:
-                continue
-                
-            message = ChatMessage(**msg_data)
-            messages.append(message)
+        # Only the caller's own messages come back from the query
+        messages_data = await firestore_service.get_chat_history(session_id, user_id=user_id)
         
-        return messages
+        # Rows were validated when written; skip re-validating each one on the way out
+        return [ChatMessage.model_construct(**msg_data) for msg_data in messages_data]
         
     except Exception as e:
         logger.error(f"Failed to get chat history: {e}")
@@ -117,7 +174,7 @@ async def test_chat(request: ChatRequest):
         ai_response = await gemini_service.generate_chat_response(
             message=request.message,
             chat_history=[],
-            system_prompt="You are an AI career advisor for Indian students. Provide helpful, practical career guidance."
+            system_prompt=_DEFAULT_SYSTEM_PROMPT
         )
         
         return {
@@ -135,6 +192,127 @@ async def test_chat(request: ChatRequest):
         }
 
 
+# user_id -> (profile signature, rendered system prompt). The signature covers every profile
+# field the prompt reads, so an edited profile simply renders a new prompt.
+_PROMPT_CACHE_MAX = 10000
+_system_prompt_cache: Dict[str, Tuple[int, str]] = {}
+
+
+def _get_system_prompt(user_id: str, user_profile: Dict[str, Any]) -> str:
+    """Return the personalized system prompt, reusing the last rendering for an unchanged profile."""
+    # Read each profile field once; both the signature and the renderer use these locals
+    skills = user_profile.get("skills") or []
+    experience_years = user_profile.get("experience_years")
+    field_of_study = user_profile.get("field_of_study")
+    location = user_profile.get("location")
+    # (additional_skills is precomputed when the resume is applied to the profile)
+    additional_skills = (user_profile.get("extracted_from_resume") or {}).get("additional_skills") or []
+    fields = (skills, experience_years, field_of_study, location, additional_skills)
+    
+    try:
+        signature = hash((tuple(skills), experience_years, field_of_study, location, tuple(additional_skills)))
+    except TypeError:
+        # Unhashable values in a hand-edited profile; just render
+        return _build_system_prompt(*fields)
+    
+    cached = _system_prompt_cache.get(user_id)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    
+    system_prompt = _build_system_prompt(*fields)
+    if len(_system_prompt_cache) >= _PROMPT_CACHE_MAX and user_id not in _system_prompt_cache:
+        _system_prompt_cache.pop(next(iter(_system_prompt_cache)), None)
+    _system_prompt_cache[user_id] = (signature, system_prompt)
+    return system_prompt
+
+
+def _build_system_prompt(skills: List[str], experience_years, field_of_study, location,
+                         additional_skills: List[str]) -> str:
+    """Build the chat system prompt, personalized with whatever the profile provides."""
+    context_parts = []
+    
+    # Add skills context
+    if skills:
+        context_parts.append(f"The user has skills in: {', '.join(skills)}")
+    
+    # Add experience context
+    if experience_years:
+        context_parts.append(f"The user has {experience_years} years of professional experience")
+    
+    # Add education/field context
+    if field_of_study:
+        context_parts.append(f"The user studied {field_of_study}")
+    
+    # Add location context
+    if location:
+        context_parts.append(f"The user is located in {location}")
+    
+    # Add resume-extracted context if available
+    if additional_skills:
+        context_parts.append(f"Additional skills from resume: {', '.join(additional_skills)}")
+    
+    if not context_parts:
+        return _DEFAULT_SYSTEM_PROMPT
+    
+    profile_context = "\n\nUser Profile Context:\n" + "\n".join(f"- {part}" for part in context_parts)
+    return _DEFAULT_SYSTEM_PROMPT + profile_context + _PROFILE_CONTEXT_FOOTER
+
+
+def _trim_history(history: List[Dict[str, Any]], max_chars: int = _HISTORY_CHAR_BUDGET) -> List[Dict[str, Any]]:
+    """Keep the most recent messages whose combined content fits within ``max_chars``.
+
+    The newest message is always kept, cut down to the budget if it is longer on its own.
+    """
+    if not history:
+        return []
+    newest = history[-1]
+    content = newest.get("content") or ""
+    if len(content) > max_chars:
+        return [{**newest, "content": content[:max_chars]}]
+    kept = [newest]
+    total = len(content)
+    for msg in reversed(history[:-1]):
+        total += len(msg.get("content") or "")
+        if total > max_chars:
+            break
+        kept.append(msg)
+    kept.reverse()
+    return kept
+
+
+async def _prepare_turn(request: ChatRequest, user_id: str):
+    """Shared setup for a chat turn.
+
+    Persists the user message before anything can fail during generation, overlapping the
+    write with the history and profile reads. Returns (session_id, chat_history,
+    user_profile, system_prompt), with the history trimmed to the prompt's character budget
+    and without the message just saved (generate_chat_response appends it anyway).
+    """
+    # Create session if not provided
+    session_id = request.session_id
+    if not session_id:
+        session_id = await firestore_service.create_chat_session(user_id)
+    
+    # Save the user message while history and profile are fetched; none of the three
+    # depends on the others
+    user_message_id, chat_history, user_profile = await asyncio.gather(
+        firestore_service.save_chat_message(
+            session_id=session_id,
+            user_id=user_id,
+            role="user",
+            content=request.message,
+            message_type="text"
+        ),
+        firestore_service.get_chat_history(session_id, limit=10, user_id=user_id),
+        firestore_service.get_user_profile(user_id),
+    )
+    user_profile = user_profile or {}
+    # The read may or may not have seen the concurrent write
+    chat_history = [msg for msg in chat_history if msg.get("id") != user_message_id]
+    
+    return session_id, _trim_history(chat_history), user_profile, _get_system_prompt(user_id, user_profile)
+
+
 @router.post("/message", response_model=ChatResponse)
 async def send_message(request: ChatRequest, token: str = Depends(security)):
     """Send a message and get AI response."""
@@ -142,64 +320,12 @@ async def send_message(request: ChatRequest, token: str = Depends(security)):
         payload = verify_token(token.credentials)
         user_id = payload.get("user_id")
         
-        # Create session if not provided
-        session_id = request.session_id
-        if not session_id:
-            session_id = await firestore_service.create_chat_session(user_id)
-        
-        # Save user message
-        user_message_id = await firestore_service.save_chat_message(
-            session_id=session_id,
-            user_id=user_id,
-            role="user",
-            content=request.message,
-            message_type="text"
+        session_id, chat_history, user_profile, system_prompt = await _prepare_turn(
+            request, user_id
         )
         
-        # Get chat history for context
-        chat_history = await firestore_service.get_chat_history(session_id, limit=10)
-        
-        # Get user profile for personalized context
-        user_profile = await firestore_service.get_user_profile(user_id) or {}
-        
-        # Build personalized system prompt with profile context
-        system_prompt = "You are an AI career advisor for Indian students. Provide helpful, practical career guidance."
-        
-        if user_profile:
-            context_parts = []
-            
-            # Add skills context
-            skills = user_profile.get("skills", [])
-            if skills:
-                context_parts.append(f"The user has skills in: {', '.join(skills)}")
-            
-            # Add experience context
-            experience_years = user_profile.get("experience_years")
-            if experience_years:
-                context_parts.append(f"The user has {experience_years} years of professional experience")
-            
-            # Add education/field context
-            field_of_study = user_profile.get("field_of_study")
-            if field_of_study:
-                context_parts.append(f"The user studied {field_of_study}")
-            
-            # Add location context
-            location = user_profile.get("location")
-            if location:
-                context_parts.append(f"The user is located in {location}")
-            
-            # Add resume-extracted context if available
-            extracted_data = user_profile.get("extracted_from_resume", {})
-            if extracted_data:
-                resume_skills = extracted_data.get("skills", [])
-                if resume_skills and set(resume_skills) - set(skills):  # New skills from resume
-                    additional_skills = list(set(resume_skills) - set(skills))
-                    context_parts.append(f"Additional skills from resume: {', '.join(additional_skills)}")
-            
-            if context_parts:
-                profile_context = "\n\nUser Profile Context:\n" + "\n".join(f"- {part}" for part in context_parts)
-                profile_context += "\n\nUse this information to provide personalized career advice relevant to their background and goals."
-                system_prompt += profile_context
+        # Suggestions only depend on the user's message and profile (pure and memoized)
+        suggestions = _generate_suggestions(request.message, user_profile)
         
         # Generate AI response using Gemini with personalized context
         ai_response = await gemini_service.generate_chat_response(
@@ -207,6 +333,8 @@ async def send_message(request: ChatRequest, token: str = Depends(security)):
             chat_history=chat_history,
             system_prompt=system_prompt
         )
+        confidence = ai_response.get("confidence", 0.8)
+        replied_at = datetime.now(timezone.utc)
         
         # Save AI response
         ai_message_id = await firestore_service.save_chat_message(
@@ -215,7 +343,7 @@ async def send_message(request: ChatRequest, token: str = Depends(security)):
             role="assistant",
             content=ai_response["response"],
             message_type="text",
-            metadata={"confidence": ai_response.get("confidence", 0.8)}
+            metadata={"confidence": confidence}
         )
         
         # Create response message object
@@ -226,17 +354,14 @@ async def send_message(request: ChatRequest, token: str = Depends(security)):
             role="assistant",
             content=ai_response["response"],
             message_type="text",
-            metadata={"confidence": ai_response.get("confidence", 0.8)},
-            timestamp="2024-01-01T00:00:00"
+            metadata={"confidence": confidence},
+            timestamp=replied_at
         )
         
-        # Generate suggestions based on message content and user profile
-        suggestions = await _generate_suggestions(request.message, user_profile)
-        
         return ChatResponse(
             message=response_message,
             suggestions=suggestions,
-            confidence_score=ai_response.get("confidence", 0.8)
+            confidence_score=confidence
         )
         
     except Exception as e:
@@ -247,6 +372,65 @@ async def send_message(request: ChatRequest, token: str = Depends(security)):
         )
 
 
+@router.post("/message/stream")
+async def stream_message(request: ChatRequest, token: str = Depends(security)):
+    """Send a message and stream the AI response as Server-Sent Events.
+
+    Emits ``data: {"text": ...}`` per generated chunk, then a final ``event: done`` carrying
+    session_id, message_id, confidence and suggestions once the reply has been saved.
+    """
+    try:
+        payload = verify_token(token.credentials)
+        user_id = payload.get("user_id")
+        
+        session_id, chat_history, user_profile, system_prompt = await _prepare_turn(
+            request, user_id
+        )
+    except Exception as e:
+        logger.error(f"Failed to start message stream: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to process message"
+        )
+    
+    async def event_source():
+        parts: List[str] = []
+        try:
+            async for chunk in gemini_service.stream_chat_response(
+                message=request.message,
+                chat_history=chat_history,
+                system_prompt=system_prompt
+            ):
+                parts.append(chunk)
+                yield b"data: " + orjson.dumps({"text": chunk}) + b"\n\n"
+            
+            confidence = 0.85 if parts else 0.3
+            ai_message_id = await firestore_service.save_chat_message(
+                session_id=session_id,
+                user_id=user_id,
+                role="assistant",
+                content="".join(parts),
+                message_type="text",
+                metadata={"confidence": confidence}
+            )
+            suggestions = _generate_suggestions(request.message, user_profile)
+            yield b"event: done\ndata: " + orjson.dumps({
+                "session_id": session_id,
+                "message_id": ai_message_id,
+                "confidence": confidence,
+                "suggestions": suggestions,
+            }) + b"\n\n"
+        except Exception as e:
+            logger.error(f"Message stream failed: {e}")
+            yield b"event: error\ndata: " + orjson.dumps({"detail": "Failed to process message"}) + b"\n\n"
+    
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.post("/analyze-career-intent")
 async def analyze_career_intent(request: ChatRequest, token: str = Depends(security)):
     """Analyze user message for career-related intent and trigger agents."""
@@ -255,7 +439,7 @@ async def analyze_career_intent(request: ChatRequest, token: str = Depends(secur
         user_id = payload.get("user_id")
         
         # Analyze message intent
-        intent = await _analyze_message_intent(request.message)
+        intent = _analyze_message_intent(request.message)
         
         if intent["type"] == "career_exploration":
             # Trigger career matching agent
@@ -266,8 +450,8 @@ async def analyze_career_intent(request: ChatRequest, token: str = Depends(secur
             )
             
             # Execute career match agent
-            if "career_match_agent" in orchestrator.agents:
-                result = await orchestrator.agents["career_match_agent"].execute(agent_input)
+            if (agent := orchestrator.agents.get("career_match_agent")) is not None:
+                result = await agent.execute(agent_input)
                 return {"intent": intent, "agent_response": result}
         
         return {"intent": intent, "message": "Intent analyzed"}
@@ -280,67 +464,88 @@ async def analyze_career_intent(request: ChatRequest, token: str = Depends(secur
         )
 
 
-async def _generate_suggestions(message: str, user_profile: dict = None) -> List[str]:
+def _generate_suggestions(message: str, user_profile: dict = None) -> List[str]:
     """Generate follow-up suggestions based on user message and profile."""
-    suggestions = []
+    tags = _scan_keywords(message.strip().lower())
+    user_profile = user_profile or {}
+    skills = user_profile.get("skills") or []
+    experience_years = user_profile.get("experience_years") or 0
+    field_of_study = user_profile.get("field_of_study") or ""
+    
+    # Only the first skill is ever used, so it stands in for the whole list in the cache key.
+    # Older or hand-edited profiles can hold other shapes here; reduce everything to hashable
+    # scalars so the memoized call can't fail on them.
+    first_skill = skills[0] if isinstance(skills, (list, tuple)) and skills else None
+    if first_skill is not None and not isinstance(first_skill, str):
+        first_skill = str(first_skill)
+    if isinstance(experience_years, bool) or not isinstance(experience_years, (int, float)):
+        try:
+            experience_years = int(experience_years)
+        except (TypeError, ValueError):
+            experience_years = 0
+    if not isinstance(field_of_study, str):
+        field_of_study = ""
     
-    message_lower = message.lower()
-    skills = user_profile.get("skills", []) if user_profile else []
-    experience_years = user_profile.get("experience_years", 0) if user_profile else 0
-    field_of_study = user_profile.get("field_of_study", "") if user_profile else ""
+    return list(_suggestions_for(tags, first_skill, experience_years, field_of_study))
+
+
+@lru_cache(maxsize=4096)
+def _suggestions_for(tags: FrozenSet[Tuple[str, str]], first_skill: Optional[str],
+                     experience_years, field_of_study) -> Tuple[str, ...]:
+    suggestions = []
     
-    if any(word in message_lower for word in ["career", "job", "profession"]):
-        if skills:
-            suggestions.append(f"How can you leverage your {skills[0]} skills for career growth?")
+    if ("suggest", "career") in tags:
+        if first_skill is not None:
+            suggestions.append(f"How can you leverage your {first_skill} skills for career growth?")
         if experience_years > 0:
             suggestions.append(f"What senior roles match your {experience_years} years of experience?")
         else:
             suggestions.append("What entry-level positions interest you?")
         suggestions.append("What industry interests you most?")
         
-    elif any(word in message_lower for word in ["skill", "learn", "course"]):
-        if skills:
-            suggestions.append(f"Want to advance your {skills[0]} skills to the next level?")
+    elif ("suggest", "skill") in tags:
+        if first_skill is not None:
+            suggestions.append(f"Want to advance your {first_skill} skills to the next level?")
         if field_of_study:
             suggestions.append(f"What advanced skills complement your {field_of_study} background?")
         suggestions.append("How much time can you dedicate to learning?")
         
-    elif any(word in message_lower for word in ["salary", "money", "pay"]):
-        if skills and experience_years:
-            suggestions.append(f"What's the salary range for {skills[0]} professionals with {experience_years} years experience?")
+    elif ("suggest", "salary") in tags:
+        if first_skill is not None and experience_years:
+            suggestions.append(f"What's the salary range for {first_skill} professionals with {experience_years} years experience?")
         elif field_of_study:
             suggestions.append(f"What are typical salaries in {field_of_study} field?")
         suggestions.append("Which location are you targeting?")
         
     else:
-        if not user_profile or not any([skills, experience_years, field_of_study]):
+        if not any([first_skill is not None, experience_years, field_of_study]):
             suggestions.append("Tell me about your background and skills")
         suggestions.extend([
             "What are your career goals?",
             "How can I help you today?"
         ])
     
-    return suggestions[:3]  # Return top 3 suggestions
+    return tuple(suggestions[:3])  # Return top 3 suggestions
 
 
-async def _analyze_message_intent(message: str) -> Dict[str, Any]:
+def _analyze_message_intent(message: str) -> Dict[str, Any]:
     """Analyze message for intent classification."""
-    message_lower = message.lower()
+    tags = _scan_keywords(message.strip().lower())
     
     # Simple intent classification
-    if any(word in message_lower for word in ["career", "job", "profession", "work"]):
+    if ("intent", "career_exploration") in tags:
         return {
             "type": "career_exploration",
             "confidence": 0.8,
             "entities": ["career"]
         }
-    elif any(word in message_lower for word in ["skill", "learn", "study", "course"]):
+    elif ("intent", "skill_development") in tags:
         return {
             "type": "skill_development",
             "confidence": 0.8,
             "entities": ["skills"]
         }
-    elif any(word in message_lower for word in ["salary", "money", "pay", "income"]):
+    elif ("intent", "salary_inquiry") in tags:
         return {
             "type": "salary_inquiry",
             "confidence": 0.7,
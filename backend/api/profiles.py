@@ -1,22 +1,115 @@
 """Profile API endpoints for user profile management."""
 
-from fastapi import APIRouter, HTTPException, Depends, status, UploadFile, File, Request
-from typing import Optional
+from fastapi import APIRouter, HTTPException, Depends, status, UploadFile, File, Header, Request, Response
+from fastapi.responses import ORJSONResponse
 from fastapi.security import HTTPBearer
 from pydantic import BaseModel
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
+from datetime import datetime, timedelta, timezone
+import asyncio
+import hashlib
 import logging
+import os
+import orjson
+import secrets
+import shutil
+
+# Optional Firebase Storage; uploads fall back to local disk without it
+try:
+    from firebase_admin import storage as fb_storage
+    FIREBASE_STORAGE_AVAILABLE = True
+except ImportError:
+    FIREBASE_STORAGE_AVAILABLE = False
 
 from models.user import UserProfile, UserProfileCreate, UserProfileUpdate
+from core.config import settings
 from core.security import verify_token
-from services.firestore_service import FirestoreService
+from core.clients import get_firestore
+from services.resume_parser import ResumeParser
 from agents.base_agent import orchestrator, AgentInput
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 security = HTTPBearer()
 
-firestore_service = FirestoreService()
+firestore_service = get_firestore()
+# Stateless after construction, so one parser serves every upload (and the PDF/DOCX
+# libraries load at startup rather than on the first upload)
+resume_parser = ResumeParser()
+
+# Resume formats ResumeParser can read; a file passes if either its type or extension matches
+# (browsers send application/octet-stream for some .doc/.docx files)
+_RESUME_CONTENT_TYPES = frozenset({
+    "application/pdf",
+    "application/msword",
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "text/plain",
+})
+_RESUME_EXTENSIONS = frozenset({"pdf", "doc", "docx", "txt"})
+
+# Firebase Storage: upload timeout (seconds) and lifetime of the signed resume link
+_RESUME_UPLOAD_TIMEOUT = 60
+_RESUME_URL_TTL = timedelta(days=7)
+
+# Static fallback payloads, encoded once at import instead of on every request
+_FALLBACK_SKILL_GAP_JSON = orjson.dumps({
+    "skill_gaps": [
+        {
+            "skill_name": "React",
+            "importance_level": 8.0,
+            "current_proficiency": 2.0,
+            "required_proficiency": 7.0,
+            "gap_score": 5.0,
+            "learning_resources": []
+        }
+    ],
+    "overall_readiness": 65.0,
+    "priority_skills": ["React", "SQL", "Git"],
+    "time_estimates": {
+        "total_weeks": 12,
+        "total_hours": 120
+    }
+})
+
+_FALLBACK_LEARNING_RESOURCES_JSON = orjson.dumps({
+    "course_recommendations": [
+        {
+            "title": "React Complete Course",
+            "provider": "Udemy",
+            "url": "https://udemy.com/react-course",
+            "type": "course",
+            "duration": "40 hours",
+            "cost": "₹3,000",
+            "rating": 4.7,
+            "difficulty_level": "beginner",
+            "skills_covered": ["React", "JavaScript"]
+        }
+    ],
+    "certification_recommendations": [],
+    "internship_opportunities": [],
+    "project_ideas": []
+})
+
+_FALLBACK_SKILL_GAP_ETAG = f'"{hashlib.md5(_FALLBACK_SKILL_GAP_JSON).hexdigest()}"'
+_FALLBACK_LEARNING_RESOURCES_ETAG = f'"{hashlib.md5(_FALLBACK_LEARNING_RESOURCES_JSON).hexdigest()}"'
+
+
+def _profile_response(profile: UserProfile) -> ORJSONResponse:
+    """Encode an already-validated profile directly.
+
+    Returning a Response skips FastAPI's second validation against ``response_model``, which
+    the profile routes keep for the OpenAPI schema only.
+    """
+    return ORJSONResponse(content=profile.model_dump(mode="json"))
+
+
+def _static_json_response(body: bytes, etag: str, if_none_match: Optional[str]) -> Response:
+    """Serve pre-encoded JSON with an ETag, answering a matching conditional GET with 304."""
+    if if_none_match:
+        candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        if etag in candidates or "*" in candidates:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
 
 
 @router.get("/me", response_model=UserProfile)
@@ -34,12 +127,12 @@ async def get_my_profile(token: str = Depends(security)):
                 detail="Profile not found"
             )
         
-        return UserProfile(**profile_data)
+        return _profile_response(UserProfile(**profile_data))
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Failed to get profile: {e}")
+        logger.error("Failed to get profile: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to get profile"
@@ -53,14 +146,16 @@ async def create_profile(profile_data: UserProfileCreate, token: str = Depends(s
         payload = verify_token(token.credentials)
         user_id = payload.get("user_id")
         
+        profile_dict = profile_data.model_dump()
+        
         # Execute profile agent to process and validate data
         agent_input = AgentInput(
             user_id=user_id,
-            data={"profile_form": profile_data.dict()}
+            data={"profile_form": profile_dict}
         )
         
-        if "profile_agent" in orchestrator.agents:
-            result = await orchestrator.agents["profile_agent"].execute(agent_input)
+        if (agent := orchestrator.agents.get("profile_agent")) is not None:
+            result = await agent.execute(agent_input)
             
             if result.success and not result.result.get("validation_errors"):
                 final_profile = result.result.get("final_profile", {})
@@ -73,7 +168,7 @@ async def create_profile(profile_data: UserProfileCreate, token: str = Depends(s
                     **final_profile
                 )
                 
-                return profile
+                return _profile_response(profile)
             else:
                 errors = result.result.get("validation_errors", ["Profile validation failed"])
                 raise HTTPException(
@@ -82,22 +177,24 @@ async def create_profile(profile_data: UserProfileCreate, token: str = Depends(s
                 )
         
         # Fallback: save directly
-        profile_dict = profile_data.dict()
         await firestore_service.save_user_profile(user_id, profile_dict)
         
-        profile = UserProfile(
+        # profile_data was validated as UserProfileCreate on the way in, so skip re-validation;
+        # its fields (nested items included) are already model instances
+        now = datetime.now(timezone.utc)
+        profile = UserProfile.model_construct(
             user_id=user_id,
-            created_at="2024-01-01T00:00:00",
-            updated_at="2024-01-01T00:00:00",
-            **profile_dict
+            created_at=now,
+            updated_at=now,
+            **dict(profile_data)
         )
         
-        return profile
+        return _profile_response(profile)
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Failed to create profile: {e}")
+        logger.error("Failed to create profile: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to create profile"
@@ -111,26 +208,21 @@ async def update_profile(profile_updates: UserProfileUpdate, token: str = Depend
         payload = verify_token(token.credentials)
         user_id = payload.get("user_id")
         
-        # Get current profile
-        current_profile = await firestore_service.get_user_profile(user_id)
-        if not current_profile:
+        # Single merge write; the merged profile is computed locally instead of read back
+        update_data = profile_updates.model_dump(exclude_unset=True)
+        updated_profile = await firestore_service.update_and_return_profile(user_id, update_data)
+        if updated_profile is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Profile not found"
             )
         
-        # Update profile
-        update_data = profile_updates.dict(exclude_unset=True)
-        await firestore_service.update_user_profile(user_id, update_data)
-        
-        # Get updated profile
-        updated_profile = await firestore_service.get_user_profile(user_id)
-        return UserProfile(**updated_profile)
+        return _profile_response(UserProfile(**updated_profile))
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Failed to update profile: {e}")
+        logger.error("Failed to update profile: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to update profile"
@@ -140,125 +232,144 @@ async def update_profile(profile_updates: UserProfileUpdate, token: str = Depend
 @router.post("/upload-resume")
 async def upload_resume(request: Request, file: UploadFile = File(...), token: str = Depends(security)):
     """Upload, store, parse resume and update user profile; returns resume metadata for preview and confirmation."""
-    from services.resume_parser import ResumeParser
     try:
-        logger.info(f"📤 Resume upload started: {file.filename}, size: {file.size if hasattr(file, 'size') else 'unknown'}")
+        logger.info("📤 Resume upload started: %s, size: %s", file.filename, file.size if hasattr(file, 'size') else 'unknown')
         
-        # Optional Firebase Storage
-        try:
-            import firebase_admin  # noqa: F401
-            from firebase_admin import storage as fb_storage
-            FIREBASE_STORAGE_AVAILABLE = True
-            logger.info("✅ Firebase Storage is available")
-        except Exception as fb_err:
-            FIREBASE_STORAGE_AVAILABLE = False
-            logger.info(f"⚠️ Firebase Storage not available: {fb_err}")
-
         payload = verify_token(token.credentials)
         user_id = payload.get("user_id")
         if not user_id:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Unauthorized")
         
-        logger.info(f"👤 User ID: {user_id}")
+        logger.info("👤 User ID: %s", user_id)
+
+        # Reject before any parsing, storage or Firestore work. The multipart body is already
+        # spooled by the time the handler runs, so the size check reads the spooled length.
+        ext = file.filename.rsplit('.', 1)[-1].lower() if '.' in (file.filename or '') else ''
+        if file.content_type not in _RESUME_CONTENT_TYPES and ext not in _RESUME_EXTENSIONS:
+            raise HTTPException(
+                status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                detail="Unsupported file type; upload a PDF, DOC, DOCX or TXT resume"
+            )
+        spooled = file.file
+        file_size = spooled.seek(0, os.SEEK_END)
+        if file_size > settings.MAX_RESUME_SIZE:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"File too large; the limit is {settings.MAX_RESUME_SIZE // (1024 * 1024)} MB"
+            )
+
+        async def _load_profile() -> Dict[str, Any]:
+            # Get current profile or create empty one
+            try:
+                return await firestore_service.get_user_profile(user_id) or {}
+            except Exception:
+                return {}
 
-        # Read file
-        content_bytes = await file.read()
-        file_size = len(content_bytes)
-        logger.info(f"📄 File read successfully: {file_size} bytes")
+        # The profile read depends only on user_id, so it runs while the file is read, parsed and stored
+        profile_task = asyncio.create_task(_load_profile())
+
+        # Starlette has already streamed the multipart body into a spooled temp file (memory up
+        # to 1 MB, disk beyond), so parsing and storage read that file instead of a bytes copy
+        logger.info("📄 File read successfully: %s bytes", file_size)
 
         # Parse using ResumeParser
-        parser = ResumeParser()
         parsed_result = None
         extracted_data = {}
         parsing_successful = False
         
         try:
             logger.info("🔍 Starting resume parsing...")
-            parsed_result = await parser.parse_file(content_bytes, file.filename)
+            parsed_result = await resume_parser.parse_file(spooled, file.filename)
             extracted_data = parsed_result.get("parsed") if parsed_result.get("success") else {}
             parsing_successful = parsed_result.get("success", False)
-            logger.info(f"✅ Parsing {'successful' if parsing_successful else 'failed'}")
+            logger.info("✅ Parsing %s", 'successful' if parsing_successful else 'failed')
         except Exception as pe:
-            logger.warning(f"Resume parsing error, falling back to raw decode: {pe}")
-            # Fallback minimal extraction: raw text only
+            logger.warning("Resume parsing error, falling back to raw decode: %s", pe)
+            # Fallback minimal extraction: raw text only. 4 KB of UTF-8 covers the 1000-char
+            # preview, so only that much of the upload is read and decoded
+            spooled.seek(0)
+            raw_bytes = spooled.read(4096)
             extracted_data = {
                 "skills": [],
                 "education_history": [],
                 "experience_years": 0,
-                "raw_text": content_bytes.decode('utf-8', errors='ignore')[:1000],
+                "raw_text": raw_bytes.decode('utf-8', errors='ignore')[:1000],
                 "confidence_score": 0,
                 "certifications": [],
                 "projects": [],
                 "languages": []
             }
 
-        # Try to store the file: Firebase first, else local fallback (/uploads)
-        resume_url = None
-        stored = False
-        if FIREBASE_STORAGE_AVAILABLE:
-            try:
-                bucket = fb_storage.bucket()
-                from datetime import datetime as _dt
-                import uuid as _uuid
-                ts = _dt.now().strftime("%Y%m%d_%H%M%S")
-                ext = file.filename.split('.')[-1] if '.' in file.filename else 'bin'
-                storage_path = f"resumes/{user_id}/{ts}_{_uuid.uuid4().hex[:8]}.{ext}"
-                blob = bucket.blob(storage_path)
-                blob.upload_from_string(content_bytes, content_type=file.content_type)
-                blob.make_public()
-                resume_url = blob.public_url
-                stored = True
-                logger.info(f"Resume stored in Firebase Storage: {storage_path}, URL: {resume_url}")
-            except Exception as se:
-                logger.warning(f"Firebase Storage upload failed; will fallback to local: {se}")
-        
-        if not stored:
-            try:
-                import os
-                from datetime import datetime as _dt
-                import uuid as _uuid
-                os.makedirs(os.path.join("uploads", "resumes", user_id), exist_ok=True)
-                ts = _dt.now().strftime("%Y%m%d_%H%M%S")
-                ext = file.filename.split('.')[-1] if '.' in file.filename else 'bin'
-                fname = f"{ts}_{_uuid.uuid4().hex[:8]}.{ext}"
-                fpath = os.path.join("uploads", "resumes", user_id, fname)
-                with open(fpath, "wb") as fh:
-                    fh.write(content_bytes)
-                rel = f"/uploads/resumes/{user_id}/{fname}"
-                # Always build absolute URL using request.base_url
-                base = str(request.base_url).rstrip('/')
-                resume_url = f"{base}{rel}"
-                logger.info(f"Resume stored locally at: {fpath}, URL: {resume_url}")
-            except Exception as le:
-                logger.error(f"Local resume store failed: {le}")
-
-        # Get current profile or create empty one
-        try:
-            current_profile = await firestore_service.get_user_profile(user_id) or {}
-        except Exception:
-            current_profile = {}
+        # One timestamp for the stored file name and the resume metadata
+        now = datetime.now(timezone.utc)
+        uploaded_at = now.isoformat()
+        resume_id = f"{now:%Y%m%d_%H%M%S}_{secrets.token_hex(4)}"
+        stored_name = f"{resume_id}.{ext or 'bin'}"
+
+        # Store the file (Firebase first, else local fallback under /uploads) in a worker thread
+        def _store_file() -> Tuple[Optional[str], bool]:
+            resume_url = None
+            stored = False
+            if FIREBASE_STORAGE_AVAILABLE:
+                try:
+                    bucket = fb_storage.bucket()
+                    storage_path = f"resumes/{user_id}/{stored_name}"
+                    blob = bucket.blob(storage_path)
+                    blob.upload_from_file(
+                        spooled, content_type=file.content_type, rewind=True,
+                        checksum="md5", timeout=_RESUME_UPLOAD_TIMEOUT, if_generation_match=0
+                    )
+                    try:
+                        # Signed in-process with the service-account key; no extra round-trip
+                        resume_url = blob.generate_signed_url(expiration=_RESUME_URL_TTL, version="v4")
+                    except Exception as sign_err:
+                        # Credentials without a private key (e.g. ADC on Cloud Run) cannot sign locally
+                        logger.info("Signed URL unavailable, making resume public: %s", sign_err)
+                        blob.make_public()
+                        resume_url = blob.public_url
+                    stored = True
+                    logger.info("Resume stored in Firebase Storage: %s, URL: %s", storage_path, resume_url)
+                except Exception as se:
+                    logger.warning("Firebase Storage upload failed; will fallback to local: %s", se)
+        
+            if not stored:
+                try:
+                    os.makedirs(os.path.join("uploads", "resumes", user_id), exist_ok=True)
+                    fname = stored_name
+                    fpath = os.path.join("uploads", "resumes", user_id, fname)
+                    spooled.seek(0)
+                    with open(fpath, "wb") as fh:
+                        shutil.copyfileobj(spooled, fh)
+                    rel = f"/uploads/resumes/{user_id}/{fname}"
+                    # Always build absolute URL using request.base_url
+                    base = str(request.base_url).rstrip('/')
+                    resume_url = f"{base}{rel}"
+                    logger.info("Resume stored locally at: %s, URL: %s", fpath, resume_url)
+                except Exception as le:
+                    logger.error("Local resume store failed: %s", le)
+            return resume_url, stored
+
+        resume_url, stored = await asyncio.to_thread(_store_file)
+        current_profile = await profile_task
 
         # Track data sources for fields populated from resume
         data_sources = current_profile.get("data_sources", {})
         
         # Build comprehensive resume metadata
-        from datetime import datetime as _dt
         resume_meta = {
             "url": resume_url,
             "filename": file.filename,
-            "uploadedAt": _dt.now().isoformat(),  # Use camelCase for frontend compatibility
-            "uploaded_at": _dt.now().isoformat(),  # Keep snake_case for backend compatibility
+            "uploaded_at": uploaded_at,  # Stored once; the frontend maps it to uploadedAt
             "file_size": file_size,
             "confidence_score": extracted_data.get("confidence_score", 0),
-            "parsed": extracted_data,  # Use 'parsed' for frontend consistency
-            "parsed_data": extracted_data,  # Keep 'parsed_data' for backend compatibility
+            "resume_id": resume_id,  # Parsed data is stored under profiles/{user_id}/resumes
             "version": current_profile.get("resume", {}).get("version", 0) + 1,  # Increment version
         }
         
         # Prepare profile updates with resume data
         updates = {
             "resume": resume_meta, 
-            "resume_parsed_at": _dt.now().isoformat()
+            "resume_parsed_at": uploaded_at
         }
 
         # Auto-populate profile fields from parsed data if not already set
@@ -273,9 +384,17 @@ async def upload_resume(request: Request, file: UploadFile = File(...), token: s
             existing_skills = [s.strip() for s in existing_skills.split(',') if s.strip()]
         parsed_skills = extracted_data.get("skills", [])
         if parsed_skills:
-            merged_skills = list(set(existing_skills + parsed_skills))
+            merged_skills = list(dict.fromkeys(existing_skills + parsed_skills))
             updates["skills"] = merged_skills
             data_sources["skills"] = "resume_merged" if existing_skills else "resume"
+            # Skills the resume contributed, worked out once here so chat turns don't redo it
+            known = frozenset(map(str.casefold, existing_skills))
+            updates["extracted_from_resume"] = {
+                "skills": parsed_skills,
+                "additional_skills": list(dict.fromkeys(
+                    sk for sk in parsed_skills if sk.casefold() not in known
+                )),
+            }
         
         # Experience years
         if not current_profile.get("experience_years") and extracted_data.get("experience_years"):
@@ -305,8 +424,8 @@ async def upload_resume(request: Request, file: UploadFile = File(...), token: s
                 for cert in parsed_certs
             ]
             # Merge with existing (avoid duplicates by name)
-            existing_names = {c.get("name", "").lower() for c in existing_certs}
-            new_certs = [c for c in formatted_certs if c["name"].lower() not in existing_names]
+            existing_names = {c["name"].casefold() for c in existing_certs if c.get("name")}
+            new_certs = [c for c in formatted_certs if c["name"].casefold() not in existing_names]
             if new_certs:
                 updates["certifications"] = existing_certs + new_certs
                 data_sources["certifications"] = "resume_merged" if existing_certs else "resume"
@@ -326,8 +445,8 @@ async def upload_resume(request: Request, file: UploadFile = File(...), token: s
                 for proj in parsed_projects
             ]
             # Merge with existing (avoid duplicates by name)
-            existing_names = {p.get("name", "").lower() for p in existing_projects}
-            new_projects = [p for p in formatted_projects if p["name"].lower() not in existing_names]
+            existing_names = {p["name"].casefold() for p in existing_projects if p.get("name")}
+            new_projects = [p for p in formatted_projects if p["name"].casefold() not in existing_names]
             if new_projects:
                 updates["projects"] = existing_projects + new_projects
                 data_sources["projects"] = "resume_merged" if existing_projects else "resume"
@@ -336,7 +455,7 @@ async def upload_resume(request: Request, file: UploadFile = File(...), token: s
         existing_languages = current_profile.get("languages", [])
         parsed_languages = extracted_data.get("languages", [])
         if parsed_languages:
-            merged_languages = list(set(existing_languages + parsed_languages))
+            merged_languages = list(dict.fromkeys(existing_languages + parsed_languages))
             updates["languages"] = merged_languages
             data_sources["languages"] = "resume_merged" if existing_languages else "resume"
         
@@ -369,13 +488,17 @@ async def upload_resume(request: Request, file: UploadFile = File(...), token: s
         # Update data_sources tracking
         updates["data_sources"] = data_sources
 
-        # Save profile updates
-        update_ok = True
-        try:
-            await firestore_service.update_user_profile(user_id, updates)
-        except Exception as ue:
-            logger.error(f"Profile update failed after resume upload: {ue}")
-            update_ok = False
+        # Save the parsed data and the profile updates together
+        parsed_saved, profile_saved = await asyncio.gather(
+            firestore_service.save_resume_parsed(user_id, resume_id, extracted_data),
+            firestore_service.update_user_profile(user_id, updates),
+            return_exceptions=True
+        )
+        if isinstance(parsed_saved, Exception):
+            logger.error("Parsed resume save failed after resume upload: %s", parsed_saved)
+        if isinstance(profile_saved, Exception):
+            logger.error("Profile update failed after resume upload: %s", profile_saved)
+        update_ok = not isinstance(parsed_saved, Exception) and not isinstance(profile_saved, Exception)
 
         # Return comprehensive confirmation with preview data
         return {
@@ -387,12 +510,12 @@ async def upload_resume(request: Request, file: UploadFile = File(...), token: s
             "resume": {
                 "url": resume_url,
                 "filename": file.filename,
-                "uploadedAt": resume_meta["uploadedAt"],  # Use camelCase
-                "uploaded_at": resume_meta["uploaded_at"],  # Keep both for compatibility
+                "uploadedAt": uploaded_at,  # Use camelCase
+                "uploaded_at": uploaded_at,  # Keep both for compatibility
                 "file_size": file_size,
                 "confidence_score": resume_meta.get("confidence_score", 0),
+                "resume_id": resume_id,
                 "version": resume_meta.get("version", 1),
-                "parsed": extracted_data,  # Include parsed data in response
             },
             "extracted_data": extracted_data,
             "profile_updated": update_ok,
@@ -403,7 +526,7 @@ async def upload_resume(request: Request, file: UploadFile = File(...), token: s
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"❌ Failed to upload resume: {type(e).__name__}: {str(e)}")
+        logger.error("❌ Failed to upload resume: %s: %s", type(e).__name__, e)
         logger.exception("Full traceback:")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -411,8 +534,45 @@ async def upload_resume(request: Request, file: UploadFile = File(...), token: s
         )
 
 
+@router.get("/resume/parsed")
+async def get_parsed_resume(token: str = Depends(security)):
+    """Get the parsed data of the user's current resume."""
+    try:
+        payload = verify_token(token.credentials)
+        user_id = payload.get("user_id")
+        
+        profile_data = await firestore_service.get_user_profile(user_id)
+        resume = (profile_data or {}).get("resume") or {}
+        if not resume:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="No resume uploaded"
+            )
+        
+        # Profiles written before resume_id still carry the parsed data inline
+        resume_id = resume.get("resume_id")
+        parsed_data = resume.get("parsed_data")
+        if parsed_data is None and resume_id:
+            parsed_data = await firestore_service.get_resume_parsed(user_id, resume_id)
+        
+        return {"resume_id": resume_id, "parsed_data": parsed_data or {}}
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Failed to get parsed resume: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to get parsed resume"
+        )
+
+
 @router.get("/skill-gap-analysis")
-async def get_skill_gap_analysis(career_id: Optional[str] = None, token: str = Depends(security)):
+async def get_skill_gap_analysis(
+    career_id: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
+    token: str = Depends(security)
+):
     """Get skill gap analysis for user profile."""
     try:
         payload = verify_token(token.credentials)
@@ -443,36 +603,19 @@ async def get_skill_gap_analysis(career_id: Optional[str] = None, token: str = D
             }
         )
         
-        if "skill_gap_agent" in orchestrator.agents:
-            result = await orchestrator.agents["skill_gap_agent"].execute(agent_input)
+        if (agent := orchestrator.agents.get("skill_gap_agent")) is not None:
+            result = await agent.execute(agent_input)
             
             if result.success:
                 return result.result
         
         # Fallback mock analysis
-        return {
-            "skill_gaps": [
-                {
-                    "skill_name": "React",
-                    "importance_level": 8.0,
-                    "current_proficiency": 2.0,
-                    "required_proficiency": 7.0,
-                    "gap_score": 5.0,
-                    "learning_resources": []
-                }
-            ],
-            "overall_readiness": 65.0,
-            "priority_skills": ["React", "SQL", "Git"],
-            "time_estimates": {
-                "total_weeks": 12,
-                "total_hours": 120
-            }
-        }
+        return _static_json_response(_FALLBACK_SKILL_GAP_JSON, _FALLBACK_SKILL_GAP_ETAG, if_none_match)
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Failed to get skill gap analysis: {e}")
+        logger.error("Failed to get skill gap analysis: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to perform skill gap analysis"
@@ -480,7 +623,10 @@ async def get_skill_gap_analysis(career_id: Optional[str] = None, token: str = D
 
 
 @router.get("/learning-resources")
-async def get_learning_resources(token: str = Depends(security)):
+async def get_learning_resources(
+    if_none_match: Optional[str] = Header(None),
+    token: str = Depends(security)
+):
     """Get personalized learning resources."""
     try:
         payload = verify_token(token.credentials)
@@ -509,36 +655,21 @@ async def get_learning_resources(token: str = Depends(security)):
             }
         )
         
-        if "resource_suggest_agent" in orchestrator.agents:
-            result = await orchestrator.agents["resource_suggest_agent"].execute(agent_input)
+        if (agent := orchestrator.agents.get("resource_suggest_agent")) is not None:
+            result = await agent.execute(agent_input)
             
             if result.success:
                 return result.result
         
         # Fallback mock resources
-        return {
-            "course_recommendations": [
-                {
-                    "title": "React Complete Course",
-                    "provider": "Udemy",
-                    "url": "https://udemy.com/react-course",
-                    "type": "course",
-                    "duration": "40 hours",
-                    "cost": "₹3,000",
-                    "rating": 4.7,
-                    "difficulty_level": "beginner",
-                    "skills_covered": ["React", "JavaScript"]
-                }
-            ],
-            "certification_recommendations": [],
-            "internship_opportunities": [],
-            "project_ideas": []
-        }
+        return _static_json_response(
+            _FALLBACK_LEARNING_RESOURCES_JSON, _FALLBACK_LEARNING_RESOURCES_ETAG, if_none_match
+        )
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Failed to get learning resources: {e}")
+        logger.error("Failed to get learning resources: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to get learning resources"
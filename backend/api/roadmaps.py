@@ -1,68 +1,109 @@
 """Roadmaps API endpoints for domain learning paths and personalized recommendations."""
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Response, status
 from fastapi.security import HTTPBearer
-from typing import List, Dict, Any
+from typing import List, Dict, Any, FrozenSet, Tuple
+import heapq
 import logging
+import orjson
 import re
 
 from core.security import verify_token
+from core.background import save_in_background
 from models.career import LearningRoadmap
-from data.domains_roadmap import DOMAINS_ROADMAP, ALL_DOMAIN_SLUGS
-from services.firestore_service import FirestoreService
+from data.domains_roadmap import DOMAINS_ROADMAP, ALL_DOMAIN_SLUGS, get_related
+from core.clients import get_firestore, get_gemini_generator
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 security = HTTPBearer()
-firestore_service = FirestoreService()
-
-# Lazy initialization of Gemini service
-_gemini_service = None
+firestore_service = get_firestore()
 
 def get_gemini_service():
-    """Get or create Gemini service instance."""
-    global _gemini_service
-    if _gemini_service is None:
-        from services.gemini_service import GeminiService
-        _gemini_service = GeminiService()
-    return _gemini_service
+    """Get the shared Gemini service instance (created on first use)."""
+    return get_gemini_generator()
+
 
+_TOKEN_RE = re.compile(r"[a-z0-9+.#]+")
 
-# Pre-compute and cache domain tokens for faster recommendation matching
-_domain_tokens_cache: Dict[str, set] = {}
 
-def _tokenize(values: List[str]) -> set:
+def _tokenize(values: List[str]) -> FrozenSet[str]:
     """Tokenize a list of strings into lowercase alphanumeric tokens."""
-    text = " \n ".join([v for v in values if isinstance(v, str)])
-    return {tok for tok in re.split(r"[^a-z0-9+.#]+", text.lower()) if tok}
-
-def _get_domain_tokens(domain_id: str, domain_data: Dict[str, Any]) -> set:
-    """Get cached tokens for a domain, computing if necessary."""
-    if domain_id not in _domain_tokens_cache:
-        _domain_tokens_cache[domain_id] = _tokenize(
-            [domain_data.get("title", "")] + 
-            domain_data.get("prerequisites", []) + 
-            domain_data.get("learning_path", [])
-        )
-    return _domain_tokens_cache[domain_id]
+    return frozenset(_TOKEN_RE.findall(" ".join(v for v in values if isinstance(v, str)).lower()))
+
+
+def _roadmap_card(domain_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Static part of a domain's recommendation card."""
+    return {
+        "domain_id": domain_data["domain_id"],
+        "title": domain_data["title"],
+        "description": domain_data.get("description", ""),
+        "difficulty_level": domain_data.get("difficulty", "mixed"),
+        "learning_path": domain_data.get("learning_path", []),
+        "prerequisites": domain_data.get("prerequisites", []),
+        "estimated_time": domain_data.get("estimated_completion"),
+        "related_domains": domain_data.get("related_domains", []),
+        "universal_foundations": domain_data.get("universal_foundations", []),
+    }
+
+
+def _build_domain_index() -> Tuple[Tuple[Tuple[Dict[str, Any], int], ...], Dict[str, Tuple[int, ...]]]:
+    """(card, token count) for every domain, plus an inverted index of token -> domain positions."""
+    domains = []
+    postings: Dict[str, List[int]] = {}
+    for position, domain_data in enumerate(DOMAINS_ROADMAP.values()):
+        tokens = _tokenize([
+            domain_data.get("title", ""),
+            *domain_data.get("prerequisites", ()),
+            *domain_data.get("learning_path", ()),
+        ])
+        domains.append((_roadmap_card(domain_data), max(1, len(tokens))))
+        for token in tokens:
+            postings.setdefault(token, []).append(position)
+    return tuple(domains), {token: tuple(positions) for token, positions in postings.items()}
+
+
+# Domain tokens and card skeletons are fixed, so they are built once at import. Scoring walks
+# the postings of the user's few tokens instead of intersecting with every domain's token set.
+_DOMAINS, _DOMAINS_BY_TOKEN = _build_domain_index()
+_MAX_RECOMMENDATIONS = 24
+
+
+def _top_recommendations(scored: List[Tuple[float, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """Top 24 (3 rows of 8 cards) by score, then title, with the scoring fields the frontend expects."""
+    top = heapq.nlargest(_MAX_RECOMMENDATIONS, scored, key=lambda x: (x[0], x[1]["title"]))
+    return [
+        {**card, "match_score": score, "skill_match_percentage": score}
+        for score, card in top
+    ]
+
+
+# What every user with no matching skills or interests gets; encoded once
+_BASELINE_RECOMMENDATIONS_JSON = orjson.dumps(_top_recommendations([(0.0, card) for card, _ in _DOMAINS]))
+
+# Roadmaps are static, so each one is validated and encoded once here; response_model on the
+# routes below only documents the schema
+_ROADMAPS_JSON: Dict[str, bytes] = {
+    domain_id: orjson.dumps(LearningRoadmap(**_roadmap_card(domain_data)).model_dump(mode="json"))
+    for domain_id, domain_data in DOMAINS_ROADMAP.items()
+}
+_ROADMAP_LIST_JSON = b"[" + b",".join(_ROADMAPS_JSON.values()) + b"]"
+
+
+def _related_slugs(domain_id: str) -> Tuple[str, ...]:
+    """The domain's own related_domains, then domains that list it as related; known ids only."""
+    candidates = (*DOMAINS_ROADMAP[domain_id].get("related_domains", ()), *get_related(domain_id))
+    return tuple(slug for slug in dict.fromkeys(candidates) if slug in _ROADMAPS_JSON and slug != domain_id)
+
+
+_RELATED_ROADMAPS_JSON: Dict[str, bytes] = {
+    domain_id: b"[" + b",".join(_ROADMAPS_JSON[slug] for slug in _related_slugs(domain_id)) + b"]"
+    for domain_id in DOMAINS_ROADMAP
+}
 
 
 @router.get("/", response_model=List[LearningRoadmap])
 async def list_roadmaps():
-    try:
-        return [LearningRoadmap(
-            domain_id=v["domain_id"],
-            title=v["title"],
-            description=v["description"],
-            difficulty_level=v.get("difficulty", "mixed"),
-            learning_path=v.get("learning_path", []),
-            prerequisites=v.get("prerequisites", []),
-            estimated_time=v.get("estimated_completion"),
-            related_domains=v.get("related_domains", []),
-            universal_foundations=v.get("universal_foundations", []),
-        ) for v in DOMAINS_ROADMAP.values()]
-    except Exception as e:
-        logger.error(f"Failed to list roadmaps: {e}")
-        raise HTTPException(status_code=500, detail="Failed to list roadmaps")
+    return Response(content=_ROADMAP_LIST_JSON, media_type="application/json")
 
 
 @router.get("/recommendations")
@@ -75,52 +116,29 @@ async def recommended_roadmaps(token: str = Depends(security)):
         payload = verify_token(token.credentials)
         user_id = payload.get("user_id")
         profile = await firestore_service.get_user_profile(user_id)
-        skills = set(map(str.lower, (profile or {}).get("skills", [])))
-        interests = set(map(str.lower, (profile or {}).get("interests", [])))
-        user_tokens = {t for t in (skills | interests) if t}
+        profile = profile or {}
+        user_tokens = frozenset(
+            value.lower()
+            for value in (*(profile.get("skills") or ()), *(profile.get("interests") or ()))
+            if isinstance(value, str) and value
+        )
 
-        ranked: List[Dict[str, Any]] = []
-        
-        # Process all domains but use cached tokens
-        for domain_id, domain_data in DOMAINS_ROADMAP.items():
-            # Use cached domain tokens to avoid recomputing every time
-            domain_tokens = _get_domain_tokens(domain_id, domain_data)
-            
-            matches = len(domain_tokens & user_tokens)
-            # Normalize by domain token size to represent how much of the roadmap aligns
-            denom = max(1, len(domain_tokens))
-            score = round(100.0 * matches / denom, 2)
-            
-            item = {
-                "domain_id": domain_data["domain_id"],
-                "title": domain_data["title"],
-                "description": domain_data.get("description", ""),
-                "difficulty_level": domain_data.get("difficulty", "mixed"),
-                "learning_path": domain_data.get("learning_path", []),
-                "prerequisites": domain_data.get("prerequisites", []),
-                "estimated_time": domain_data.get("estimated_completion"),
-                "related_domains": domain_data.get("related_domains", []),
-                "universal_foundations": domain_data.get("universal_foundations", []),
-                # scoring fields expected by frontend
-                "match_score": score,
-                "skill_match_percentage": score,
-            }
-            ranked.append(item)
-
-        # Sort by score descending
-        ranked.sort(key=lambda x: (x["match_score"], x["title"]), reverse=True)
-        
-        # Return top 24 recommendations (3 rows of 8 cards) plus all with score > 0
-        # This ensures we show meaningful matches while not overwhelming the UI
-        top_matches = [r for r in ranked if r["match_score"] > 0][:24]
-        
-        # If we have fewer than 24 matches, fill with top-rated domains
-        if len(top_matches) < 24:
-            remaining = 24 - len(top_matches)
-            zero_score = [r for r in ranked if r["match_score"] == 0][:remaining]
-            top_matches.extend(zero_score)
+        # Normalize matches by domain token size to represent how much of the roadmap aligns
+        matches = [0] * len(_DOMAINS)
+        matched = False
+        for token in user_tokens:
+            for position in _DOMAINS_BY_TOKEN.get(token, ()):
+                matches[position] += 1
+                matched = True
+        if not matched:
+            return Response(content=_BASELINE_RECOMMENDATIONS_JSON, media_type="application/json")
+        scored = [
+            (round(100.0 * count / denom, 2), card)
+            for count, (card, denom) in zip(matches, _DOMAINS)
+        ]
         
-        return top_matches
+        # Matching domains come first and any remaining slots are filled with zero-score domains
+        return _top_recommendations(scored)
         
     except Exception as e:
         logger.error(f"Failed to get roadmap recommendations: {e}")
@@ -129,30 +147,24 @@ async def recommended_roadmaps(token: str = Depends(security)):
 
 @router.get("/{domain_id}", response_model=LearningRoadmap)
 async def get_roadmap(domain_id: str):
-    try:
-        data = DOMAINS_ROADMAP.get(domain_id)
-        if not data:
-            raise HTTPException(status_code=404, detail="Roadmap not found")
-        return LearningRoadmap(
-            domain_id=data["domain_id"],
-            title=data["title"],
-            description=data["description"],
-            difficulty_level=data.get("difficulty", "mixed"),
-            learning_path=data.get("learning_path", []),
-            prerequisites=data.get("prerequisites", []),
-            estimated_time=data.get("estimated_completion"),
-            related_domains=data.get("related_domains", []),
-            universal_foundations=data.get("universal_foundations", []),
-        )
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Failed to get roadmap: {e}")
-        raise HTTPException(status_code=500, detail="Failed to get roadmap")
+    roadmap_json = _ROADMAPS_JSON.get(domain_id)
+    if roadmap_json is None:
+        raise HTTPException(status_code=404, detail="Roadmap not found")
+    return Response(content=roadmap_json, media_type="application/json")
+
+
+@router.get("/{domain_id}/related", response_model=List[LearningRoadmap])
+async def get_related_roadmaps(domain_id: str):
+    """Roadmaps related to a domain in either direction."""
+    related_json = _RELATED_ROADMAPS_JSON.get(domain_id)
+    if related_json is None:
+        raise HTTPException(status_code=404, detail="Roadmap not found")
+    return Response(content=related_json, media_type="application/json")
 
 
 @router.post("/{domain_id}/personalized")
-async def generate_personalized_roadmap(domain_id: str, token: str = Depends(security)):
+async def generate_personalized_roadmap(domain_id: str, background_tasks: BackgroundTasks,
+                                        token: str = Depends(security)):
     """
     Generate a personalized learning roadmap for a domain using AI.
     Uses Gemini AI to create customized learning paths based on user profile and resume.
@@ -185,15 +197,11 @@ async def generate_personalized_roadmap(domain_id: str, token: str = Depends(sec
             resume_data=resume_data
         )
         
-        # Save the generated roadmap to user's profile for future reference
-        try:
-            await firestore_service.save_personalized_roadmap(
-                user_id,
-                domain_id,
-                personalized_roadmap
-            )
-        except Exception as save_error:
-            logger.warning(f"Could not save personalized roadmap: {save_error}")
+        # Save the generated roadmap for future reference once the response is sent
+        background_tasks.add_task(
+            save_in_background, "personalized roadmap",
+            firestore_service.save_personalized_roadmap, user_id, domain_id, personalized_roadmap
+        )
         
         return personalized_roadmap
         
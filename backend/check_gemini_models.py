@@ -1,5 +1,6 @@
 """Check available Gemini models."""
 import os
+import sys
 from dotenv import load_dotenv
 import google.generativeai as genai
 
@@ -12,10 +13,9 @@ if not api_key:
 
 genai.configure(api_key=api_key)
 
-print("Available Gemini models:")
-print("-" * 60)
+# Build the whole report and write it once rather than three prints per model
+lines = ["Available Gemini models:", "-" * 60]
 for model in genai.list_models():
     if 'generateContent' in model.supported_generation_methods:
-        print(f"✓ {model.name}")
-        print(f"  Description: {model.description}")
-        print()
+        lines += [f"✓ {model.name}", f"  Description: {model.description}", ""]
+sys.stdout.write("\n".join(lines) + "\n")
@@ -0,0 +1,16 @@
+"""Helpers for work scheduled to run after a response has been sent."""
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+async def save_in_background(label: str, save, *args) -> None:
+    """Run a Firestore save after the response is sent, logging instead of raising.
+
+    Meant for ``BackgroundTasks.add_task``; ``label`` names the document in the log line.
+    """
+    try:
+        await save(*args)
+    except Exception as e:
+        logger.warning("Background save of %s failed: %s", label, e)
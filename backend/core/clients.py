@@ -0,0 +1,32 @@
+"""Process-wide service clients shared by the API routers.
+
+Each getter builds its service on first use and hands the same instance to every caller,
+so the routers share one Firestore handle (and one in-memory fallback) and configure the
+Gemini SDK once per process.
+"""
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def get_firestore():
+    """Shared FirestoreService."""
+    from services.firestore_service import FirestoreService
+    return FirestoreService()
+
+
+@lru_cache(maxsize=None)
+def get_gemini():
+    """Shared chat-oriented GeminiService (falls back to canned replies without an API key)."""
+    from services.gemini_service_real import GeminiService
+    return GeminiService()
+
+
+@lru_cache(maxsize=None)
+def get_gemini_generator():
+    """Shared structured-generation GeminiService.
+
+    Raises ValueError when GEMINI_API_KEY is missing; failures are not cached, so a later call
+    retries once the key is configured.
+    """
+    from services.gemini_service import GeminiService
+    return GeminiService()
@@ -0,0 +1,22 @@
+"""Cheap wall-clock timestamps for hot request paths."""
+
+import time
+from datetime import datetime, timezone
+
+# (epoch second, formatted ISO string) - replaced atomically as a tuple
+_now_cache = (0, "")
+
+
+def utc_now_iso() -> str:
+    """Return the current UTC time as an ISO-8601 string (second granularity).
+
+    The formatted string is cached and only rebuilt when the wall-clock second changes,
+    so bursts of requests share one ``datetime`` allocation and ``isoformat`` call.
+    """
+    global _now_cache
+    t = int(time.time())
+    cached_t, cached_iso = _now_cache
+    if t != cached_t:
+        cached_iso = datetime.fromtimestamp(t, tz=timezone.utc).isoformat()
+        _now_cache = (t, cached_iso)
+    return cached_iso
@@ -20,6 +20,13 @@ class Settings(BaseSettings):
     SECRET_KEY: str = "default-dev-secret-key-change-in-production"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    # Verified-token cache: seconds a payload is reused (never past its exp; 0 disables) and max entries
+    JWT_CACHE_TTL: int = 60
+    JWT_CACHE_MAX: int = 10000
+    # Seconds a rejected token is answered with 401 without re-verifying (0 disables)
+    JWT_REJECT_CACHE_TTL: int = 5
+    # Largest resume upload accepted, in bytes (matches the frontend's 10 MB limit)
+    MAX_RESUME_SIZE: int = 10 * 1024 * 1024
     
     # CORS Configuration
     BACKEND_CORS_ORIGINS: List[str] = [
@@ -40,6 +47,12 @@ class Settings(BaseSettings):
     
     # Firestore Configuration
     FIRESTORE_DATABASE: str = "(default)"
+    # Threads for blocking Firestore calls (run via asyncio.to_thread); 0 = min(32, 4 * CPUs)
+    FIRESTORE_IO_WORKERS: int = 0
+    # How long a fetched user profile is served from the in-process cache (0 disables it).
+    # Writes only invalidate the cache of the process that made them; other workers can
+    # serve a stale profile for up to this long.
+    PROFILE_CACHE_TTL_SECONDS: int = 300
     
     # BigQuery Configuration
     BIGQUERY_DATASET: str = "career_data"
@@ -53,6 +66,12 @@ class Settings(BaseSettings):
         validation_alias=AliasChoices("GEMINI_TEMPERATURE", "GEMINI_temperature"),
     )
     GEMINI_API_KEY: Optional[str] = None
+    # Cap on concurrent Gemini generations per worker and per-call time budget (seconds)
+    GEMINI_MAX_CONCURRENCY: int = Field(
+        8,
+        validation_alias=AliasChoices("GEMINI_MAX_CONCURRENCY", "GEMINI_MAX_CONC"),
+    )
+    GEMINI_TIMEOUT_SECONDS: float = 60.0
     
     # Firebase Configuration
     FIREBASE_PROJECT_ID: Optional[str] = None
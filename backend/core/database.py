@@ -1,7 +1,10 @@
-"""Database connection management for Firestore."""
+"""Database connection management for Firestore and BigQuery."""
 
+import asyncio
 import logging
 import os
+from functools import lru_cache
+from typing import Any, Dict, Optional
 from core.config import settings
 
 logger = logging.getLogger(__name__)
@@ -18,39 +21,55 @@ except Exception:  # pragma: no cover
 firestore_db = None
 
 
+@lru_cache(maxsize=1)
+def _env_service_account() -> Optional[Dict[str, Any]]:
+    """Service-account info assembled from FIREBASE_* settings, or None when incomplete.
+
+    Settings don't change after startup, so the key is unescaped and the dict built only once.
+    """
+    private_key = settings.FIREBASE_PRIVATE_KEY
+    client_email = settings.FIREBASE_CLIENT_EMAIL
+    project_id = settings.FIREBASE_PROJECT_ID
+    if not (private_key and client_email and project_id):
+        return None
+    return {
+        "type": "service_account",
+        "project_id": project_id,
+        "private_key_id": settings.FIREBASE_PRIVATE_KEY_ID or "",
+        "private_key": private_key.replace('\\n', '\n'),
+        "client_email": client_email,
+        "client_id": settings.FIREBASE_CLIENT_ID or "",
+        "auth_uri": settings.FIREBASE_AUTH_URI or "https://accounts.google.com/o/oauth2/auth",
+        "token_uri": settings.FIREBASE_TOKEN_URI or "https://oauth2.googleapis.com/token",
+        "auth_provider_x509_cert_url": "https://www.googleapis.com/oauth2/v1/certs",
+        "client_x509_cert_url": f"https://www.googleapis.com/robot/v1/metadata/x509/{client_email}"
+    }
+
+
 def _init_firebase_admin_if_possible():
     """Initialize Firebase Admin if credentials are available."""
     if firebase_admin is None:
         return None
     try:
         if not firebase_admin._apps:
+            admin_credentials = settings.FIREBASE_ADMIN_CREDENTIALS
+            google_credentials = settings.GOOGLE_APPLICATION_CREDENTIALS
             # Prefer explicit service account from env variables
-            if settings.FIREBASE_PRIVATE_KEY and settings.FIREBASE_CLIENT_EMAIL and settings.FIREBASE_PROJECT_ID:
-                private_key = settings.FIREBASE_PRIVATE_KEY.replace('\\n', '\n')
-                cred = credentials.Certificate({
-                    "type": "service_account",
-                    "project_id": settings.FIREBASE_PROJECT_ID,
-                    "private_key_id": settings.FIREBASE_PRIVATE_KEY_ID or "",
-                    "private_key": private_key,
-                    "client_email": settings.FIREBASE_CLIENT_EMAIL,
-                    "client_id": settings.FIREBASE_CLIENT_ID or "",
-                    "auth_uri": settings.FIREBASE_AUTH_URI or "https://accounts.google.com/o/oauth2/auth",
-                    "token_uri": settings.FIREBASE_TOKEN_URI or "https://oauth2.googleapis.com/token",
-                    "auth_provider_x509_cert_url": "https://www.googleapis.com/oauth2/v1/certs",
-                    "client_x509_cert_url": f"https://www.googleapis.com/robot/v1/metadata/x509/{settings.FIREBASE_CLIENT_EMAIL}"
-                })
+            service_account = _env_service_account()
+            if service_account is not None:
+                cred = credentials.Certificate(service_account)
                 firebase_admin.initialize_app(cred)
                 logger.info("Initialized Firebase Admin from env service account")
             # Check for FIREBASE_ADMIN_CREDENTIALS file path
-            elif settings.FIREBASE_ADMIN_CREDENTIALS and os.path.exists(settings.FIREBASE_ADMIN_CREDENTIALS):
-                cred = credentials.Certificate(settings.FIREBASE_ADMIN_CREDENTIALS)
+            elif admin_credentials and os.path.exists(admin_credentials):
+                cred = credentials.Certificate(admin_credentials)
                 firebase_admin.initialize_app(cred)
-                logger.info(f"Initialized Firebase Admin from credentials file: {settings.FIREBASE_ADMIN_CREDENTIALS}")
+                logger.info(f"Initialized Firebase Admin from credentials file: {admin_credentials}")
             # Check for GOOGLE_APPLICATION_CREDENTIALS file
-            elif settings.GOOGLE_APPLICATION_CREDENTIALS and os.path.exists(settings.GOOGLE_APPLICATION_CREDENTIALS):
-                cred = credentials.Certificate(settings.GOOGLE_APPLICATION_CREDENTIALS)
+            elif google_credentials and os.path.exists(google_credentials):
+                cred = credentials.Certificate(google_credentials)
                 firebase_admin.initialize_app(cred)
-                logger.info(f"Initialized Firebase Admin from Google credentials: {settings.GOOGLE_APPLICATION_CREDENTIALS}")
+                logger.info(f"Initialized Firebase Admin from Google credentials: {google_credentials}")
             # Try using Application Default Credentials (works in Cloud Run)
             else:
                 try:
@@ -71,14 +90,14 @@ async def initialize_connections():
     """Initialize Firestore connection."""
     global firestore_db
     try:
-        real_client = _init_firebase_admin_if_possible()
+        # Credential loading and the ADC metadata-server lookup block, so keep them off the loop
+        real_client = await asyncio.to_thread(_init_firebase_admin_if_possible)
         if real_client is not None:
             firestore_db = real_client
             logger.info("Firestore connection initialized (real)")
         else:
             logger.warning("Failed to initialize Firebase Admin - no credentials found")
             # In production, we want this to fail, but let's try to continue
-            from core.config import settings
             if not settings.DEBUG:
                 logger.error("Production environment requires Firebase credentials")
                 raise RuntimeError("Firestore initialization failed - credentials required in production")
@@ -87,7 +106,6 @@ async def initialize_connections():
     except Exception as e:
         logger.error(f"Failed to initialize Firestore connection: {e}")
         # Only raise in production
-        from core.config import settings
         if not settings.DEBUG:
             raise
         else:
@@ -98,4 +116,11 @@ def get_firestore_db():
     """Get Firestore database client."""
     if firestore_db is None:
         raise RuntimeError("Firestore not initialized")
-    return firestore_db
\ No newline at end of file
+    return firestore_db
+
+
+@lru_cache(maxsize=1)
+def get_bigquery_client():
+    """Get the shared BigQuery client, created on first use from the project settings."""
+    from google.cloud import bigquery
+    return bigquery.Client(project=settings.GOOGLE_CLOUD_PROJECT, location=settings.BIGQUERY_LOCATION)
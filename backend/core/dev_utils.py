@@ -5,8 +5,16 @@ from fastapi.security import HTTPBearer
 from typing import Optional
 import logging
 
+from core.config import settings
+
 logger = logging.getLogger(__name__)
 
+_MOCK_USER = {
+    "user_id": "debug_user_123",
+    "email": "debug@example.com",
+    "name": "Debug User"
+}
+
 
 class OptionalHTTPBearer(HTTPBearer):
     """HTTPBearer that doesn't require authentication in development mode."""
@@ -15,22 +23,15 @@ class OptionalHTTPBearer(HTTPBearer):
         super().__init__(auto_error=auto_error)
     
     async def __call__(self, request) -> Optional[str]:
-        from core.config import settings
-        
         # If in debug mode and no authorization header, create a mock token
-        if settings.DEBUG:
-            authorization = request.headers.get("Authorization")
-            if not authorization:
-                logger.warning("No auth header in DEBUG mode, creating mock token")
-                return None  # This will trigger mock user creation in endpoints
+        if settings.DEBUG and not request.headers.get("Authorization"):
+            logger.warning("No auth header in DEBUG mode, creating mock token")
+            return None  # This will trigger mock user creation in endpoints
         
         return await super().__call__(request)
 
 
 def get_mock_user_from_no_auth():
     """Create a mock user when no authentication is provided in debug mode."""
-    return {
-        "user_id": "debug_user_123",
-        "email": "debug@example.com",
-        "name": "Debug User"
-    }
\ No newline at end of file
+    # Copied so a caller filling in fields doesn't change the user handed to the next request
+    return dict(_MOCK_USER)
\ No newline at end of file
@@ -1,9 +1,11 @@
 """Security utilities for authentication and authorization."""
 
+import hashlib
+import time
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
+import bcrypt
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from fastapi import HTTPException, status
 from core.config import settings
 
@@ -12,16 +14,35 @@ try:
 except Exception:  # pragma: no cover
     firebase_auth = None
 
-# Password hashing (kept for potential local auth flows)
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Verified token payloads: sha256(token) -> (expires_at epoch seconds, payload).
+# Signature checks are skipped for a recently seen token, never past its own exp. Keys are
+# digests so bearer tokens themselves aren't kept around in process memory.
+_token_cache: Dict[bytes, Tuple[float, Dict[str, Any]]] = {}
+# Recently rejected tokens: sha256(token) -> retry-after epoch seconds, so a client replaying
+# a bad token can't force a signature check (or Firebase round-trip) on every request.
+_rejected_tokens: Dict[bytes, float] = {}
+
+
+def _token_key(token: str) -> bytes:
+    return hashlib.sha256(token.encode()).digest()
+
+
+# Password hashing (kept for potential local auth flows). bcrypt only reads the first 72 bytes;
+# truncating explicitly keeps the behaviour passlib had, where newer bcrypt releases would raise.
+_BCRYPT_ROUNDS = 12
+_BCRYPT_MAX_BYTES = 72
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    try:
+        return bcrypt.checkpw(plain_password.encode()[:_BCRYPT_MAX_BYTES], hashed_password.encode())
+    except ValueError:
+        # Not a bcrypt hash
+        return False
 
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return bcrypt.hashpw(password.encode()[:_BCRYPT_MAX_BYTES], bcrypt.gensalt(rounds=_BCRYPT_ROUNDS)).decode()
 
 
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
@@ -31,29 +52,79 @@ def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta]
     return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
 
 
+def _cache_token(key: bytes, payload: Dict[str, Any]) -> None:
+    now = time.time()
+    expires_at = now + settings.JWT_CACHE_TTL
+    exp = payload.get("exp")
+    if isinstance(exp, (int, float)):
+        expires_at = min(expires_at, exp)
+    if expires_at <= now:
+        return
+    if len(_token_cache) >= settings.JWT_CACHE_MAX and key not in _token_cache:
+        _token_cache.pop(next(iter(_token_cache)), None)
+    _token_cache[key] = (expires_at, payload)
+
+
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+def _reject_token(key: bytes) -> None:
+    if settings.JWT_REJECT_CACHE_TTL <= 0:
+        return
+    if len(_rejected_tokens) >= settings.JWT_CACHE_MAX and key not in _rejected_tokens:
+        _rejected_tokens.pop(next(iter(_rejected_tokens)), None)
+    _rejected_tokens[key] = time.time() + settings.JWT_REJECT_CACHE_TTL
+
+
 def verify_token(token: str) -> Dict[str, Any]:
     """Verify Firebase ID token if available, else fallback to local JWT."""
+    key = _token_key(token)
+    now = time.time()
+    cached = _token_cache.get(key)
+    if cached is not None:
+        if cached[0] > now:
+            return dict(cached[1])
+        _token_cache.pop(key, None)
+    rejected_until = _rejected_tokens.get(key)
+    if rejected_until is not None:
+        if rejected_until > now:
+            raise _credentials_exception()
+        _rejected_tokens.pop(key, None)
+
+    # Only a definitive answer may put the token on the rejected list; a transient Firebase
+    # failure (certificate fetch, network) must not lock out a valid ID token
+    definitive = firebase_auth is None
+
     # Try Firebase first
     if firebase_auth is not None:
         try:
             decoded = firebase_auth.verify_id_token(token)
             # Normalize payload fields expected by the app
-            return {
+            payload = {
                 "user_id": decoded.get("uid"),
                 "email": decoded.get("email"),
                 "name": decoded.get("name"),
                 **decoded,
             }
+            _cache_token(key, payload)
+            return dict(payload)
+        except (firebase_auth.InvalidIdTokenError, ValueError):
+            # Invalid, expired or revoked ID token, or no Firebase app configured here
+            definitive = True
         except Exception:
             pass
 
     # Fallback to local JWT for development/tests
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        return payload
+        _cache_token(key, payload)
+        return dict(payload)
     except JWTError:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Could not validate credentials",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
\ No newline at end of file
+        if definitive:
+            _reject_token(key)
+        raise _credentials_exception()
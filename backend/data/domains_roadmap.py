@@ -6,7 +6,9 @@ Emerging Tech (11), Mobile & Gaming (5), Specialized Engineering (14), Business
 Research & Advanced (4) = 75 total domains.
 """
 from __future__ import annotations
-from typing import Dict, List
+import sys
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Tuple
 
 UNIVERSAL_FOUNDATIONS: List[str] = [
     "Programming",
@@ -20,7 +22,7 @@ UNIVERSAL_FOUNDATIONS: List[str] = [
 ]
 
 # Complete dataset for all 85 domains with detailed learning paths
-DOMAINS_ROADMAP: Dict[str, dict] = {
+_DOMAINS: Dict[str, dict] = {
     "data-analytics": {
         "domain_id": "data-analytics",
         "title": "Data Analytics",
@@ -1455,9 +1457,46 @@ DOMAINS_ROADMAP: Dict[str, dict] = {
     },
 }
 
-# Complete list of all domain slugs
-ALL_DOMAIN_SLUGS: List[str] = list(DOMAINS_ROADMAP.keys())
 
+# The dataset is only ever read, and every router shares it: freeze it once at import so it
+# can't be mutated under concurrent requests. String lists become tuples of interned strings.
+_LIST_FIELDS = ("prerequisites", "learning_path", "related_domains", "universal_foundations")
+_UNIVERSAL_FOUNDATIONS = tuple(map(sys.intern, UNIVERSAL_FOUNDATIONS))
+
+
+def _freeze_domain(domain: dict) -> Mapping[str, Any]:
+    frozen = dict(domain)
+    for field in _LIST_FIELDS:
+        value = frozen.get(field)
+        if value is UNIVERSAL_FOUNDATIONS:
+            # Shared by every domain, so share one tuple too
+            frozen[field] = _UNIVERSAL_FOUNDATIONS
+        elif value is not None:
+            frozen[field] = tuple(map(sys.intern, value))
+    return MappingProxyType(frozen)
+
+
+DOMAINS_ROADMAP: Mapping[str, Mapping[str, Any]] = MappingProxyType({
+    sys.intern(slug): _freeze_domain(domain) for slug, domain in _DOMAINS.items()
+})
+UNIVERSAL_FOUNDATIONS: Tuple[str, ...] = _UNIVERSAL_FOUNDATIONS
 
 # Complete list of all domain slugs
-ALL_DOMAIN_SLUGS: List[str] = list(DOMAINS_ROADMAP.keys())
+ALL_DOMAIN_SLUGS: Tuple[str, ...] = tuple(DOMAINS_ROADMAP)
+
+
+def _build_related_index() -> Mapping[str, Tuple[str, ...]]:
+    referrers: Dict[str, List[str]] = {}
+    for slug, domain in DOMAINS_ROADMAP.items():
+        for related in domain.get("related_domains", ()):
+            referrers.setdefault(related, []).append(slug)
+    return MappingProxyType({slug: tuple(slugs) for slug, slugs in referrers.items()})
+
+
+# Reverse of related_domains: slug -> domains that list it as related
+RELATED_INDEX: Mapping[str, Tuple[str, ...]] = _build_related_index()
+
+
+def get_related(slug: str) -> Tuple[str, ...]:
+    """Domains whose related_domains include ``slug`` (empty when none do)."""
+    return RELATED_INDEX.get(slug, ())
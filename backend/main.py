@@ -13,10 +13,12 @@ load_dotenv()
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 import uvicorn
+import asyncio
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
 
 from core.config import settings
@@ -47,6 +49,14 @@ async def lifespan(app: FastAPI):
         os.makedirs(os.path.join("uploads", "resumes"), exist_ok=True)
     except Exception as e:
         logger.warning(f"Could not create uploads directory: {e}")
+    # The Firestore client is synchronous and its calls are pushed to the default executor;
+    # size that pool so concurrent requests' round trips overlap on the client's channel
+    io_workers = settings.FIRESTORE_IO_WORKERS or min(32, (os.cpu_count() or 1) * 4)
+    io_executor = ThreadPoolExecutor(max_workers=io_workers, thread_name_prefix="firestore-io")
+    asyncio.get_running_loop().set_default_executor(io_executor)
+    # Warm the chat model connection in the background; startup doesn't wait for it, and it
+    # overlaps the Firebase credential setup below
+    warmup_task = asyncio.create_task(chat.gemini_service.warmup())
     await initialize_connections()
     logger.info("Application startup complete.")
     
@@ -54,6 +64,8 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down AI Career Advisor Backend...")
+    warmup_task.cancel()
+    io_executor.shutdown(wait=False)
 
 
 # Create FastAPI application
@@ -63,6 +75,7 @@ app = FastAPI(
     description="A multi-agent AI system for personalized career guidance",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -103,7 +116,7 @@ async def root():
 async def value_error_handler(request, exc):
     """Handle ValueError exceptions."""
     logger.error(f"ValueError: {exc}")
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=400,
         content={"error": "Invalid input", "detail": str(exc)}
     )
@@ -113,7 +126,7 @@ async def value_error_handler(request, exc):
 async def general_exception_handler(request, exc):
     """Handle general exceptions."""
     logger.error(f"Unhandled exception: {exc}")
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={"error": "Internal server error"}
     )
@@ -130,7 +130,7 @@ class LearningRoadmap(BaseModel):
     domain_id: str
     title: str
     description: str
-    difficulty_level: str = Field(..., pattern=r"^(beginner|intermediate|advanced|mixed)$")
+    difficulty_level: str = Field(..., pattern=r"^(beginner|intermediate|advanced|expert|mixed)$")
     learning_path: List[str] = []  # ordered steps
     prerequisites: List[str] = []
     estimated_time: str | None = None
@@ -63,7 +63,8 @@ class ResumeMetadata(BaseModel):
     uploaded_at: Optional[datetime] = None
     file_size: Optional[int] = None
     confidence_score: Optional[float] = None
-    parsed_data: Optional[Dict[str, Any]] = None
+    resume_id: Optional[str] = None  # Parsed data lives in profiles/{user_id}/resumes/{resume_id}
+    parsed_data: Optional[Dict[str, Any]] = None  # Only on profiles written before resume_id
     version: int = 1  # For tracking resume versions
 
 
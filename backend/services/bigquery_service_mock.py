@@ -15,7 +15,7 @@ class BigQueryService:
     
     async def get_career_trends(self) -> List[Dict[str, Any]]:
         """Get career trends data."""
-        logger.info("Getting mock career trends")
+        logger.debug("Getting mock career trends")
         return [
             {
                 "field": "Software Engineering",
@@ -39,7 +39,7 @@ class BigQueryService:
     
     async def get_skill_demand_trends(self, skills: List[str]) -> Dict[str, Any]:
         """Get skill demand trends."""
-        logger.info(f"Getting mock skill demand for: {skills}")
+        logger.debug("Getting mock skill demand for: %s", skills)
         return {
             "Python": {"demand": "High", "growth": "+40%"},
             "React": {"demand": "High", "growth": "+35%"},
@@ -49,7 +49,7 @@ class BigQueryService:
     
     async def search_careers(self, query: str, filters: Dict[str, Any] = None) -> List[Dict[str, Any]]:
         """Search for careers."""
-        logger.info(f"Mock career search for: {query}")
+        logger.debug("Mock career search for: %s", query)
         return [
             {
                 "id": "job_1",
@@ -77,7 +77,7 @@ class BigQueryService:
     
     async def get_salary_insights(self, role: str, location: str = None) -> Dict[str, Any]:
         """Get salary insights for a role."""
-        logger.info(f"Getting mock salary insights for: {role}")
+        logger.debug("Getting mock salary insights for: %s", role)
         return {
             "role": role,
             "avg_salary": "₹12L",
@@ -1,19 +1,47 @@
 """Firestore service for user data and chat history management."""
 
+import asyncio
+import copy
 import logging
-from typing import Dict, Any, List, Optional
+import time
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 import uuid
 
+from google.api_core.exceptions import AlreadyExists
 from google.cloud import firestore
 from google.cloud.firestore_v1 import FieldFilter
 
+from core.config import settings
 from core.database import get_firestore_db
 from models.user import UserProfile
 from models.chat import ChatMessage, ChatSession
 
 logger = logging.getLogger(__name__)
 
+# Profiles change rarely but are read on every chat turn and most profile endpoints.
+# Shared by all FirestoreService instances in the process: user_id -> (expires_at, profile)
+_PROFILE_CACHE_MAX = 10000
+_profile_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+# In-flight Firestore reads by user_id, shared by concurrent cache misses
+_profile_reads: Dict[str, "asyncio.Future"] = {}
+
+
+def _cache_profile(user_id: str, profile: Dict[str, Any]) -> None:
+    ttl = settings.PROFILE_CACHE_TTL_SECONDS
+    if ttl <= 0:
+        return
+    if len(_profile_cache) >= _PROFILE_CACHE_MAX and user_id not in _profile_cache:
+        # Drop the oldest insertion; dicts keep insertion order
+        _profile_cache.pop(next(iter(_profile_cache)), None)
+    _profile_cache[user_id] = (time.monotonic() + ttl, profile)
+
+
+def invalidate_cached_profile(user_id: str) -> None:
+    """Forget the cached profile for a user after any write to it."""
+    _profile_cache.pop(user_id, None)
+    _profile_reads.pop(user_id, None)
+
 
 class FirestoreService:
     """Service for Firestore database operations."""
@@ -23,6 +51,8 @@ class FirestoreService:
         # Development fallback (in-memory) when Firestore isn't initialized
         self.use_mock = False
         self._mock_profiles: Dict[str, Any] = {}
+        self._mock_resumes: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._mock_roadmaps: Dict[str, Dict[str, Any]] = {}
     
     def _get_db(self):
         """Get Firestore database client."""
@@ -50,20 +80,17 @@ class FirestoreService:
             }
             # created_at should not be overwritten if already present
             if not self.use_mock:
-                # Merge without overwriting existing fields
                 doc_ref = db.collection("profiles").document(user_id)
-                # Preserve created_at if exists; otherwise set it
-                try:
-                    existing = doc_ref.get()
-                    if existing.exists:
-                        # Merge with existing; do not touch created_at
-                        doc_ref.set(profile_doc, merge=True)
-                    else:
-                        profile_doc["created_at"] = datetime.now()
+
+                def _write():
+                    # New profiles (the common case here) take a single create() round-trip;
+                    # an existing one is merged without touching its created_at
+                    try:
+                        doc_ref.create({**profile_doc, "created_at": profile_doc["updated_at"]})
+                    except AlreadyExists:
                         doc_ref.set(profile_doc, merge=True)
-                except Exception:
-                    profile_doc["created_at"] = datetime.now()
-                    doc_ref.set(profile_doc, merge=True)
+
+                await asyncio.to_thread(_write)
             else:
                 # In-memory mock upsert
                 existing = self._mock_profiles.get(user_id) or {}
@@ -74,6 +101,7 @@ class FirestoreService:
                 merged = {**existing, **profile_doc}
                 self._mock_profiles[user_id] = merged
             
+            invalidate_cached_profile(user_id)
             logger.info(f"User profile saved (merge) for user: {user_id}")
             return user_id
             
@@ -89,11 +117,34 @@ class FirestoreService:
             if self.use_mock:
                 return self._mock_profiles.get(user_id)
             
-            doc_ref = db.collection("profiles").document(user_id)
-            doc = doc_ref.get()
+            cached = _profile_cache.get(user_id)
+            if cached is not None:
+                if cached[0] > time.monotonic():
+                    # Deep copy: callers mutate nested fields (data_sources, lists) in place
+                    return copy.deepcopy(cached[1])
+                _profile_cache.pop(user_id, None)
+            
+            # Concurrent misses for the same user (a dashboard fires several profile-backed
+            # requests at once) share a single Firestore read
+            read = _profile_reads.get(user_id)
+            leader = read is None
+            if leader:
+                doc_ref = db.collection("profiles").document(user_id)
+                read = asyncio.ensure_future(asyncio.to_thread(doc_ref.get))
+                _profile_reads[user_id] = read
+            try:
+                doc = await asyncio.shield(read)
+            finally:
+                # A write during the read drops the entry, so a stale result isn't cached
+                current = leader and _profile_reads.get(user_id) is read
+                if current:
+                    del _profile_reads[user_id]
             
             if doc.exists:
-                return doc.to_dict()
+                profile = doc.to_dict()
+                if current:
+                    _cache_profile(user_id, copy.deepcopy(profile))
+                return profile
             else:
                 logger.warning(f"Profile not found for user: {user_id}")
                 return None
@@ -107,7 +158,7 @@ class FirestoreService:
         try:
             db = self._get_db()
             
-            updates = {**(updates or {}), "updated_at": datetime.now()}
+            updates = {"updated_at": datetime.now(), **(updates or {})}
 
             if self.use_mock:
                 existing = self._mock_profiles.get(user_id) or {"user_id": user_id, "created_at": datetime.now()}
@@ -116,8 +167,9 @@ class FirestoreService:
             else:
                 doc_ref = db.collection("profiles").document(user_id)
                 # Upsert via merge to avoid failures when doc doesn't exist
-                doc_ref.set(updates, merge=True)
+                await asyncio.to_thread(doc_ref.set, updates, merge=True)
             
+            invalidate_cached_profile(user_id)
             logger.info(f"User profile updated (merge) for user: {user_id}")
             return True
             
@@ -125,6 +177,73 @@ class FirestoreService:
             logger.error(f"Failed to update user profile: {e}")
             raise
     
+    async def update_and_return_profile(self, user_id: str,
+                                        updates: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Merge updates into an existing profile and return the merged document.
+        
+        Returns None when the profile doesn't exist. The merged document is computed from
+        the (usually cached) current profile, so the update costs a single merge write and
+        no read-back. That profile may be stale if another worker wrote meanwhile, so the
+        merge is only returned, never cached; the write drops the cache entry and the next
+        read goes to Firestore.
+        """
+        current = await self.get_user_profile(user_id)
+        if current is None:
+            return None
+        
+        updates = {**(updates or {}), "updated_at": datetime.now()}
+        await self.update_user_profile(user_id, updates)
+        
+        return {**current, **updates}
+    
+    async def save_resume_parsed(self, user_id: str, resume_id: str,
+                                 parsed_data: Dict[str, Any]) -> str:
+        """Store parsed resume data under profiles/{user_id}/resumes/{resume_id}.
+        
+        Kept out of the profile document so that every profile read stays small; the
+        profile's resume metadata only carries the resume_id.
+        """
+        try:
+            db = self._get_db()
+            
+            resume_doc = {
+                "resume_id": resume_id,
+                "parsed_data": parsed_data,
+                "created_at": datetime.now(),
+            }
+            
+            if self.use_mock:
+                self._mock_resumes[(user_id, resume_id)] = resume_doc
+            else:
+                doc_ref = (db.collection("profiles").document(user_id)
+                           .collection("resumes").document(resume_id))
+                await asyncio.to_thread(doc_ref.set, resume_doc)
+            
+            logger.info(f"Parsed resume saved: {resume_id} for user {user_id}")
+            return resume_id
+            
+        except Exception as e:
+            logger.error(f"Failed to save parsed resume: {e}")
+            raise
+    
+    async def get_resume_parsed(self, user_id: str, resume_id: str) -> Optional[Dict[str, Any]]:
+        """Get parsed resume data stored by save_resume_parsed."""
+        try:
+            db = self._get_db()
+            
+            if self.use_mock:
+                resume_doc = self._mock_resumes.get((user_id, resume_id))
+                return resume_doc["parsed_data"] if resume_doc else None
+            
+            doc_ref = (db.collection("profiles").document(user_id)
+                       .collection("resumes").document(resume_id))
+            doc = await asyncio.to_thread(doc_ref.get)
+            return (doc.to_dict() or {}).get("parsed_data") if doc.exists else None
+            
+        except Exception as e:
+            logger.error(f"Failed to get parsed resume: {e}")
+            raise
+    
     async def create_chat_session(self, user_id: str, title: Optional[str] = None) -> str:
         """Create a new chat session."""
         try:
@@ -170,17 +289,17 @@ class FirestoreService:
                 "timestamp": datetime.now()
             }
             
-            # Save message
-            doc_ref = db.collection("chat_messages").document(message_id)
-            doc_ref.set(message_doc)
-            
-            # Update session message count
-            session_ref = db.collection("chat_sessions").document(session_id)
-            session_ref.update({
+            # Save message and update session message count in one commit
+            batch = db.batch()
+            batch.set(db.collection("chat_messages").document(message_id), message_doc)
+            batch.update(db.collection("chat_sessions").document(session_id), {
                 "message_count": firestore.Increment(1),
-                "updated_at": datetime.now()
+                "updated_at": message_doc["timestamp"]
             })
             
+            # Blocking client calls run off the event loop so callers can overlap them
+            await asyncio.to_thread(batch.commit)
+            
             logger.info(f"Chat message saved: {message_id}")
             return message_id
             
@@ -188,18 +307,20 @@ class FirestoreService:
             logger.error(f"Failed to save chat message: {e}")
             raise
     
-    async def get_chat_history(self, session_id: str, limit: int = 50) -> List[Dict[str, Any]]:
-        """Get chat history for a session."""
+    async def get_chat_history(self, session_id: str, limit: int = 50,
+                               user_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Get chat history for a session, optionally only the messages owned by ``user_id``."""
         try:
             db = self._get_db()
             
-            # Simple query without ordering to avoid index requirement
-            query = (db.collection("chat_messages")
-                    .where(filter=FieldFilter("session_id", "==", session_id))
-                    .limit(limit))
+            # Simple query without ordering to avoid index requirement; equality filters
+            # alone are served by Firestore's single-field indexes
+            query = db.collection("chat_messages").where(filter=FieldFilter("session_id", "==", session_id))
+            if user_id is not None:
+                query = query.where(filter=FieldFilter("user_id", "==", user_id))
+            query = query.limit(limit)
             
-            docs = query.stream()
-            messages = [doc.to_dict() for doc in docs]
+            messages = await asyncio.to_thread(lambda: [doc.to_dict() for doc in query.stream()])
             
             # Sort in Python instead of Firestore to avoid index requirement
             messages.sort(key=lambda x: x.get('timestamp', ''), reverse=False)
@@ -335,6 +456,34 @@ class FirestoreService:
             logger.error(f"Failed to save personalized path: {e}")
             raise
     
+    async def save_personalized_roadmap(self, user_id: str, domain_id: str,
+                                        roadmap_data: Dict[str, Any]) -> str:
+        """Save the latest personalized roadmap for a user and domain (regenerating overwrites it)."""
+        try:
+            db = self._get_db()
+            
+            roadmap_id = f"{user_id}_{domain_id}"
+            roadmap_doc = {
+                "id": roadmap_id,
+                "user_id": user_id,
+                "domain_id": domain_id,
+                "created_at": datetime.now(),
+                **roadmap_data
+            }
+            
+            if self.use_mock:
+                self._mock_roadmaps[roadmap_id] = roadmap_doc
+            else:
+                doc_ref = db.collection("personalized_roadmaps").document(roadmap_id)
+                await asyncio.to_thread(doc_ref.set, roadmap_doc)
+            
+            logger.info(f"Personalized roadmap saved: {roadmap_id}")
+            return roadmap_id
+            
+        except Exception as e:
+            logger.error(f"Failed to save personalized roadmap: {e}")
+            raise
+    
     async def get_user_analytics(self, user_id: str) -> Dict[str, Any]:
         """Get analytics data for a user."""
         try:
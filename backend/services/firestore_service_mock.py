@@ -22,7 +22,7 @@ class FirestoreService:
     
     async def create_user_profile(self, user_id: str, profile_data: Dict[str, Any]) -> str:
         """Create a new user profile."""
-        logger.info(f"Creating mock user profile for: {user_id}")
+        logger.debug("Creating mock user profile for: %s", user_id)
         from datetime import datetime
         # Ensure required fields are present
         if "user_id" not in profile_data:
@@ -37,7 +37,7 @@ class FirestoreService:
     
     async def get_user_profile(self, user_id: str) -> Optional[Dict[str, Any]]:
         """Get user profile."""
-        logger.info(f"Getting mock user profile for: {user_id}")
+        logger.debug("Getting mock user profile for: %s", user_id)
         from datetime import datetime
         return self.data["user_profiles"].get(user_id, {
             "user_id": user_id,
@@ -57,7 +57,7 @@ class FirestoreService:
     
     async def update_user_profile(self, user_id: str, updates: Dict[str, Any]) -> None:
         """Update user profile."""
-        logger.info(f"Updating mock user profile for: {user_id}")
+        logger.debug("Updating mock user profile for: %s", user_id)
         from datetime import datetime
         if user_id not in self.data["user_profiles"]:
             self.data["user_profiles"][user_id] = {
@@ -72,7 +72,7 @@ class FirestoreService:
     async def create_chat_session(self, user_id: str) -> str:
         """Create a new chat session."""
         session_id = f"session_{len(self.data['chat_sessions']) + 1}"
-        logger.info(f"Creating mock chat session: {session_id}")
+        logger.debug("Creating mock chat session: %s", session_id)
         self.data["chat_sessions"][session_id] = {
             "user_id": user_id,
             "messages": [],
@@ -82,7 +82,7 @@ class FirestoreService:
     
     async def add_chat_message(self, session_id: str, message: Dict[str, Any]) -> None:
         """Add message to chat session."""
-        logger.info(f"Adding message to mock session: {session_id}")
+        logger.debug("Adding message to mock session: %s", session_id)
         if session_id in self.data["chat_sessions"]:
             self.data["chat_sessions"][session_id]["messages"].append(message)
     
@@ -92,14 +92,14 @@ class FirestoreService:
     
     async def get_chat_messages(self, session_id: str) -> List[Dict[str, Any]]:
         """Get chat messages."""
-        logger.info(f"Getting mock chat messages for: {session_id}")
+        logger.debug("Getting mock chat messages for: %s", session_id)
         if session_id in self.data["chat_sessions"]:
             return self.data["chat_sessions"][session_id]["messages"]
         return []
     
     async def get_user_chat_sessions(self, user_id: str) -> List[Dict[str, Any]]:
         """Get user's chat sessions."""
-        logger.info(f"Getting mock chat sessions for user: {user_id}")
+        logger.debug("Getting mock chat sessions for user: %s", user_id)
         return [
             {
                 "id": session_id,
@@ -112,12 +112,12 @@ class FirestoreService:
     
     async def save_user_analytics(self, user_id: str, analytics_data: Dict[str, Any]) -> None:
         """Save user analytics."""
-        logger.info(f"Saving mock analytics for user: {user_id}")
+        logger.debug("Saving mock analytics for user: %s", user_id)
         self.data["analytics"][user_id] = analytics_data
     
     async def get_user_analytics(self, user_id: str) -> Dict[str, Any]:
         """Get user analytics."""
-        logger.info(f"Getting mock analytics for user: {user_id}")
+        logger.debug("Getting mock analytics for user: %s", user_id)
         return self.data["analytics"].get(user_id, {
             "session_count": 5,
             "message_count": 25,
@@ -195,8 +195,8 @@ class GeminiService:
                 "max_output_tokens": 8192,  # Increased from 2048 for longer responses
             }
             
-            # Generate response
-            response = self.model.generate_content(
+            # Generate response without blocking the event loop
+            response = await self.model.generate_content_async(
                 prompt,
                 generation_config=generation_config,
                 safety_settings=self.safety_settings
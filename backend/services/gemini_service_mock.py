@@ -16,7 +16,7 @@ class GeminiService:
     
     async def generate_response(self, prompt: str, context: Optional[str] = None) -> str:
         """Generate a mock response."""
-        logger.info(f"Mock Gemini response for prompt: {prompt[:50]}...")
+        logger.debug("Mock Gemini response for prompt: %s...", prompt[:50])
         
         # Mock responses based on prompt content
         if "career" in prompt.lower():
@@ -30,7 +30,7 @@ class GeminiService:
     
     async def analyze_intent(self, message: str) -> Dict[str, Any]:
         """Analyze the intent of a user message."""
-        logger.info(f"Mock intent analysis for: {message[:50]}...")
+        logger.debug("Mock intent analysis for: %s...", message[:50])
         
         # Mock intent analysis
         if any(word in message.lower() for word in ["job", "career", "role", "position"]):
@@ -60,7 +60,7 @@ class GeminiService:
     
     async def generate_career_recommendations(self, user_profile: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Generate career recommendations based on user profile."""
-        logger.info("Generating mock career recommendations")
+        logger.debug("Generating mock career recommendations")
         
         # Mock career recommendations
         return [
@@ -89,7 +89,7 @@ class GeminiService:
     
     async def generate_skill_gap_analysis(self, user_skills: List[str], target_role: str) -> Dict[str, Any]:
         """Analyze skill gaps for a target role."""
-        logger.info(f"Mock skill gap analysis for: {target_role}")
+        logger.debug("Mock skill gap analysis for: %s", target_role)
         
         # Mock skill gap analysis
         return {
@@ -109,7 +109,7 @@ class GeminiService:
     
     async def generate_learning_resources(self, skills: List[str]) -> List[Dict[str, Any]]:
         """Generate learning resource recommendations."""
-        logger.info(f"Generating mock learning resources for: {skills}")
+        logger.debug("Generating mock learning resources for: %s", skills)
         
         # Mock learning resources
         return [
@@ -142,7 +142,7 @@ class GeminiService:
     async def generate_chat_response(self, message: str, chat_history: List[Dict[str, str]] = None,
                                    system_prompt: str = None) -> Dict[str, Any]:
         """Generate a chat response using mock Gemini."""
-        logger.info(f"Mock chat response for: {message[:50]}...")
+        logger.debug("Mock chat response for: %s...", message[:50])
         
         response_text = await self.generate_response(message)
         intent = await self.analyze_intent(message)
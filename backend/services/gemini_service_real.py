@@ -3,7 +3,8 @@
 import os
 import json
 import logging
-from typing import List, Dict, Any, Optional
+import time
+from typing import List, Dict, Any, Optional, AsyncIterator
 import google.generativeai as genai
 from google.generativeai.types import HarmCategory, HarmBlockThreshold
 
@@ -25,6 +26,8 @@ class GeminiService:
             except:
                 pass
         
+        self._warmed_at = 0.0
+        
         if not self.api_key:
             logger.warning("GEMINI_API_KEY not found, using mock service")
             self._is_mock = True
@@ -51,6 +54,20 @@ class GeminiService:
             logger.error(f"Failed to initialize Gemini service: {e}")
             self._is_mock = True
     
+    async def warmup(self) -> None:
+        """Open the API connection ahead of the first real request.
+
+        Uses a token count, which needs no generation; skipped if the connection was warmed
+        in the last couple of minutes.
+        """
+        if self._is_mock or time.monotonic() - self._warmed_at < 120:
+            return
+        self._warmed_at = time.monotonic()
+        try:
+            await self.model.count_tokens_async("ping")
+        except Exception as e:
+            logger.warning(f"Gemini warmup failed: {e}")
+    
     async def generate_response(self, prompt: str, context: Optional[str] = None) -> str:
         """Generate a response using Gemini AI."""
         if self._is_mock:
@@ -92,23 +109,7 @@ class GeminiService:
             return self._mock_chat_response(message)
         
         try:
-            # Build conversation context
-            conversation_context = ""
-            if chat_history:
-                for msg in chat_history[-5:]:  # Last 5 messages for context
-                    role = msg.get("role", "user")
-                    content = msg.get("content", "")
-                    conversation_context += f"{role.capitalize()}: {content}\n"
-            
-            # Create the prompt
-            full_prompt = f"""{system_prompt}
-
-Previous conversation:
-{conversation_context}
-
-Current user message: {message}
-
-Please provide a helpful, specific response as an AI career advisor for Indian students."""
+            full_prompt = self._build_chat_prompt(message, chat_history, system_prompt)
             
             # Generate response
             response = self.model.generate_content(
@@ -137,6 +138,56 @@ Please provide a helpful, specific response as an AI career advisor for Indian s
                 "model_used": "gemini-2.5-flash"
             }
     
+    def _build_chat_prompt(self, message: str, chat_history: List[Dict[str, Any]], system_prompt: str) -> str:
+        """Assemble the single-turn prompt used for chat responses."""
+        # Build conversation context
+        conversation_context = ""
+        if chat_history:
+            for msg in chat_history[-5:]:  # Last 5 messages for context
+                role = msg.get("role", "user")
+                content = msg.get("content", "")
+                conversation_context += f"{role.capitalize()}: {content}\n"
+        
+        # Create the prompt
+        full_prompt = f"""{system_prompt}
+
+Previous conversation:
+{conversation_context}
+
+Current user message: {message}
+
+Please provide a helpful, specific response as an AI career advisor for Indian students."""
+        return full_prompt
+    
+    async def stream_chat_response(self, message: str, chat_history: List[Dict[str, Any]],
+                                   system_prompt: str) -> AsyncIterator[str]:
+        """Yield a chat response chunk by chunk as Gemini generates it."""
+        if self._is_mock:
+            yield self._mock_chat_response(message)["response"]
+            return
+        
+        emitted = False
+        try:
+            full_prompt = self._build_chat_prompt(message, chat_history, system_prompt)
+            response = await self.model.generate_content_async(
+                full_prompt,
+                safety_settings=self.safety_settings,
+                stream=True
+            )
+            async for chunk in response:
+                text = chunk.text
+                if text:
+                    emitted = True
+                    yield text
+        except Exception as e:
+            logger.error(f"Error in streamed chat response generation: {e}")
+            if not emitted:
+                yield "I'm having trouble processing your request right now. Please try again."
+            return
+        
+        if not emitted:
+            yield "I couldn't generate a proper response. Could you please rephrase your question?"
+    
     async def analyze_intent(self, message: str) -> Dict[str, Any]:
         """Analyze the intent of a user message using Gemini."""
         if self._is_mock:
@@ -2,7 +2,7 @@
 
 import csv
 import logging
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterator
 from datetime import datetime
 import pandas as pd
 from jobspy import scrape_jobs
@@ -45,6 +45,38 @@ class JobScraperService:
         Returns:
             List of job dictionaries
         """
+        return list(self.iter_scrape_jobs(
+            search_term=search_term,
+            location=location,
+            results_wanted=results_wanted,
+            hours_old=hours_old,
+            country_indeed=country_indeed,
+            google_search_term=google_search_term,
+            site_name=site_name,
+            linkedin_fetch_description=linkedin_fetch_description
+        ))
+    
+    def iter_scrape_jobs(
+        self,
+        search_term: str,
+        location: str = "India",
+        results_wanted: int = 20,
+        hours_old: int = 72,
+        country_indeed: str = "India",
+        google_search_term: Optional[str] = None,
+        site_name: Optional[List[str]] = None,
+        linkedin_fetch_description: bool = False
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Scrape job listings and yield them one formatted job at a time.
+        
+        Takes the same arguments as ``scrape_jobs``. Rows are formatted lazily from the
+        scraped DataFrame, so callers can stream results without holding every
+        formatted job in memory at once.
+        
+        Yields:
+            Formatted job dictionaries
+        """
         try:
             # Use provided sites or default supported sites
             sites = site_name if site_name else self.supported_sites
@@ -69,23 +101,27 @@ class JobScraperService:
                 linkedin_fetch_description=linkedin_fetch_description
             )
             
-            if jobs_df is None or jobs_df.empty:
-                logger.warning(f"No jobs found for: {search_term} in {location}")
-                return []
-            
-            logger.info(f"Found {len(jobs_df)} jobs")
-            
-            # Convert DataFrame to list of dictionaries
-            jobs_list = jobs_df.to_dict('records')
-            
-            # Clean and format the data
-            formatted_jobs = self._format_jobs(jobs_list)
-            
-            return formatted_jobs
-            
         except Exception as e:
             logger.error(f"Error scraping jobs: {e}")
             raise
+        
+        if jobs_df is None or jobs_df.empty:
+            logger.warning(f"No jobs found for: {search_term} in {location}")
+            return
+        
+        logger.info(f"Found {len(jobs_df)} jobs")
+        
+        # Walk the DataFrame row by row instead of materializing to_dict('records')
+        for job in self._iter_records(jobs_df):
+            formatted_job = self._format_job(job)
+            if formatted_job is not None:
+                yield formatted_job
+    
+    def _iter_records(self, jobs_df: pd.DataFrame) -> Iterator[Dict[str, Any]]:
+        """Yield DataFrame rows as dictionaries without building the full records list."""
+        columns = list(jobs_df.columns)
+        for row in jobs_df.itertuples(index=False, name=None):
+            yield dict(zip(columns, row))
     
     def _format_jobs(self, jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
@@ -100,46 +136,58 @@ class JobScraperService:
         formatted = []
         
         for job in jobs:
-            try:
-                # Handle potential None/NaN values
-                formatted_job = {
-                    "id": self._generate_job_id(job),
-                    "title": self._safe_str(job.get("title")),
-                    "company": self._safe_str(job.get("company")),
-                    "location": self._safe_str(job.get("location")),
-                    "job_type": self._safe_str(job.get("job_type")),
-                    "date_posted": self._format_date(job.get("date_posted")),
-                    "salary_source": self._safe_str(job.get("salary_source")),
-                    "interval": self._safe_str(job.get("interval")),
-                    "min_amount": self._safe_number(job.get("min_amount")),
-                    "max_amount": self._safe_number(job.get("max_amount")),
-                    "currency": self._safe_str(job.get("currency")),
-                    "is_remote": self._safe_bool(job.get("is_remote")),
-                    "job_url": self._safe_str(job.get("job_url")),
-                    "job_url_direct": self._safe_str(job.get("job_url_direct")),
-                    "site": self._safe_str(job.get("site")),
-                    "description": self._safe_str(job.get("description")),
-                    "emails": self._safe_list(job.get("emails")),
-                    "company_url": self._safe_str(job.get("company_url")),
-                    "company_url_direct": self._safe_str(job.get("company_url_direct")),
-                    "company_addresses": self._safe_str(job.get("company_addresses")),
-                    "company_num_employees": self._safe_str(job.get("company_num_employees")),
-                    "company_revenue": self._safe_str(job.get("company_revenue")),
-                    "company_description": self._safe_str(job.get("company_description")),
-                    "ceo_name": self._safe_str(job.get("ceo_name")),
-                    "ceo_photo_url": self._safe_str(job.get("ceo_photo_url")),
-                    "logo_photo_url": self._safe_str(job.get("logo_photo_url")),
-                    "banner_photo_url": self._safe_str(job.get("banner_photo_url")),
-                }
-                
+            formatted_job = self._format_job(job)
+            if formatted_job is not None:
                 formatted.append(formatted_job)
-                
-            except Exception as e:
-                logger.warning(f"Error formatting job: {e}")
-                continue
         
         return formatted
     
+    def _format_job(self, job: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Format and clean a single job record.
+        
+        Args:
+            job: Raw job data from jobspy
+            
+        Returns:
+            Formatted job data, or None if the record could not be formatted
+        """
+        try:
+            # Handle potential None/NaN values
+            return {
+                "id": self._generate_job_id(job),
+                "title": self._safe_str(job.get("title")),
+                "company": self._safe_str(job.get("company")),
+                "location": self._safe_str(job.get("location")),
+                "job_type": self._safe_str(job.get("job_type")),
+                "date_posted": self._format_date(job.get("date_posted")),
+                "salary_source": self._safe_str(job.get("salary_source")),
+                "interval": self._safe_str(job.get("interval")),
+                "min_amount": self._safe_number(job.get("min_amount")),
+                "max_amount": self._safe_number(job.get("max_amount")),
+                "currency": self._safe_str(job.get("currency")),
+                "is_remote": self._safe_bool(job.get("is_remote")),
+                "job_url": self._safe_str(job.get("job_url")),
+                "job_url_direct": self._safe_str(job.get("job_url_direct")),
+                "site": self._safe_str(job.get("site")),
+                "description": self._safe_str(job.get("description")),
+                "emails": self._safe_list(job.get("emails")),
+                "company_url": self._safe_str(job.get("company_url")),
+                "company_url_direct": self._safe_str(job.get("company_url_direct")),
+                "company_addresses": self._safe_str(job.get("company_addresses")),
+                "company_num_employees": self._safe_str(job.get("company_num_employees")),
+                "company_revenue": self._safe_str(job.get("company_revenue")),
+                "company_description": self._safe_str(job.get("company_description")),
+                "ceo_name": self._safe_str(job.get("ceo_name")),
+                "ceo_photo_url": self._safe_str(job.get("ceo_photo_url")),
+                "logo_photo_url": self._safe_str(job.get("logo_photo_url")),
+                "banner_photo_url": self._safe_str(job.get("banner_photo_url")),
+            }
+            
+        except Exception as e:
+            logger.warning(f"Error formatting job: {e}")
+            return None
+    
     def _generate_job_id(self, job: Dict[str, Any]) -> str:
         """Generate a unique ID for a job."""
         # Use combination of company, title, and site
@@ -1,9 +1,10 @@
 """
 Resume parsing service for extracting structured data from PDF and DOCX files.
 """
+import asyncio
 import io
 import re
-from typing import Dict, List, Any, Optional
+from typing import BinaryIO, Dict, List, Any, Optional, Union
 from datetime import datetime
 import logging
 
@@ -21,50 +22,98 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Canonical skills list for matching
+CANONICAL_SKILLS = (
+    "python", "javascript", "java", "c++", "c#", "go", "golang", "rust", "swift",
+    "kotlin", "typescript", "php", "ruby", "scala", "r", "matlab", "sql", "nosql",
+    "react", "vue", "angular", "node.js", "express", "django", "flask", "fastapi",
+    "spring", "laravel", "rails", "next.js", "svelte", "html", "css", "sass",
+    "bootstrap", "tailwind", "jquery", "redux", "vuex", "webpack", "babel",
+    "docker", "kubernetes", "aws", "azure", "gcp", "google cloud", "linux", "unix",
+    "git", "github", "gitlab", "ci/cd", "jenkins", "terraform", "ansible",
+    "mongodb", "postgresql", "mysql", "redis", "elasticsearch", "cassandra",
+    "machine learning", "ml", "artificial intelligence", "ai", "deep learning",
+    "neural networks", "tensorflow", "pytorch", "pandas", "numpy", "scikit-learn",
+    "data analysis", "data science", "statistics", "tableau", "power bi", "excel",
+    "spark", "hadoop", "kafka", "airflow", "etl", "data engineering",
+    "cybersecurity", "penetration testing", "ethical hacking", "network security",
+    "ui/ux", "user experience", "user interface", "figma", "sketch", "adobe xd",
+    "photoshop", "illustrator", "graphic design", "web design", "mobile development",
+    "android", "ios", "react native", "flutter", "xamarin", "unity", "game development",
+    "blockchain", "ethereum", "solidity", "smart contracts", "cryptocurrency",
+    "agile", "scrum", "kanban", "project management", "jira", "confluence",
+    "communication", "teamwork", "leadership", "problem solving", "analytical thinking"
+)
+
+# Resume tokens: runs of letters/digits/+/# joined by inner dots, so "c++", "c#" and "node.js"
+# come out whole while trailing punctuation ("python,", "aws.") is dropped
+_TOKEN_PATTERN = re.compile(r'[a-z0-9+#]+(?:\.[a-z0-9+#]+)*')
+
+# Skills that are a single token are found by intersecting the resume's tokens with this set
+_SINGLE_TOKEN_SKILLS = frozenset(skill for skill in CANONICAL_SKILLS if _TOKEN_PATTERN.fullmatch(skill))
+
+# The rest ("machine learning", "ci/cd", "scikit-learn", ...) share one compiled alternation
+_PHRASE_SKILL_PATTERN = re.compile(
+    r'(?<![\w+#])(?:'
+    + '|'.join(re.escape(skill) for skill in CANONICAL_SKILLS if skill not in _SINGLE_TOKEN_SKILLS)
+    + r')(?![\w+#])'
+)
+
+# Education keywords for extraction
+EDUCATION_KEYWORDS = (
+    "bachelor", "master", "phd", "doctorate", "degree", "diploma", "certificate",
+    "university", "college", "institute", "school", "academy",
+    "b.tech", "b.e.", "b.sc", "b.a", "b.com", "bba", "bca",
+    "m.tech", "m.e.", "m.sc", "m.a", "m.com", "mba", "mca",
+    "engineering", "computer science", "information technology", "software engineering",
+    "data science", "business administration", "management", "marketing", "finance"
+)
+
+# Certification keywords
+CERTIFICATION_KEYWORDS = (
+    "certified", "certification", "certificate", "accredited", "credential",
+    "aws", "azure", "google cloud", "gcp", "cisco", "microsoft", "oracle",
+    "pmp", "scrum master", "cissp", "ceh", "comptia", "itil"
+)
+
+# Internship/Experience keywords
+EXPERIENCE_KEYWORDS = (
+    "intern", "internship", "trainee", "co-op", "work experience",
+    "employment", "position", "role", "job", "worked at", "working at"
+)
+
+
+def _substring_pattern(keywords) -> "re.Pattern[str]":
+    """Compile keywords into one alternation that behaves like any(kw in line for kw in keywords)."""
+    return re.compile('|'.join(re.escape(keyword) for keyword in keywords))
+
+
+# Per-line keyword checks run once per resume line, so each list is scanned as one pattern
+_EDUCATION_KEYWORD_PATTERN = _substring_pattern(EDUCATION_KEYWORDS)
+_CERTIFICATION_KEYWORD_PATTERN = _substring_pattern(CERTIFICATION_KEYWORDS)
+_EXPERIENCE_KEYWORD_PATTERN = _substring_pattern(EXPERIENCE_KEYWORDS)
+
+# Spoken languages, matched as whole words so e.g. "tamilnadu" is not read as Tamil
+COMMON_LANGUAGES = (
+    "english", "hindi", "spanish", "french", "german", "chinese", "mandarin",
+    "japanese", "korean", "arabic", "portuguese", "russian", "italian",
+    "tamil", "telugu", "marathi", "bengali", "gujarati", "kannada", "malayalam"
+)
+_LANGUAGE_PATTERN = re.compile(r'\b(?:' + '|'.join(COMMON_LANGUAGES) + r')\b')
+
 
 class ResumeParser:
     """Lightweight resume parser for PDF and DOCX files."""
     
     def __init__(self):
         # Canonical skills list for matching
-        self.canonical_skills = [
-            "python", "javascript", "java", "c++", "c#", "go", "golang", "rust", "swift",
-            "kotlin", "typescript", "php", "ruby", "scala", "r", "matlab", "sql", "nosql",
-            "react", "vue", "angular", "node.js", "express", "django", "flask", "fastapi",
-            "spring", "laravel", "rails", "next.js", "svelte", "html", "css", "sass",
-            "bootstrap", "tailwind", "jquery", "redux", "vuex", "webpack", "babel",
-            "docker", "kubernetes", "aws", "azure", "gcp", "google cloud", "linux", "unix",
-            "git", "github", "gitlab", "ci/cd", "jenkins", "terraform", "ansible",
-            "mongodb", "postgresql", "mysql", "redis", "elasticsearch", "cassandra",
-            "machine learning", "ml", "artificial intelligence", "ai", "deep learning",
-            "neural networks", "tensorflow", "pytorch", "pandas", "numpy", "scikit-learn",
-            "data analysis", "data science", "statistics", "tableau", "power bi", "excel",
-            "spark", "hadoop", "kafka", "airflow", "etl", "data engineering",
-            "cybersecurity", "penetration testing", "ethical hacking", "network security",
-            "ui/ux", "user experience", "user interface", "figma", "sketch", "adobe xd",
-            "photoshop", "illustrator", "graphic design", "web design", "mobile development",
-            "android", "ios", "react native", "flutter", "xamarin", "unity", "game development",
-            "blockchain", "ethereum", "solidity", "smart contracts", "cryptocurrency",
-            "agile", "scrum", "kanban", "project management", "jira", "confluence",
-            "communication", "teamwork", "leadership", "problem solving", "analytical thinking"
-        ]
+        self.canonical_skills = CANONICAL_SKILLS
         
         # Education keywords for extraction
-        self.education_keywords = [
-            "bachelor", "master", "phd", "doctorate", "degree", "diploma", "certificate",
-            "university", "college", "institute", "school", "academy",
-            "b.tech", "b.e.", "b.sc", "b.a", "b.com", "bba", "bca",
-            "m.tech", "m.e.", "m.sc", "m.a", "m.com", "mba", "mca",
-            "engineering", "computer science", "information technology", "software engineering",
-            "data science", "business administration", "management", "marketing", "finance"
-        ]
+        self.education_keywords = EDUCATION_KEYWORDS
         
         # Certification keywords
-        self.certification_keywords = [
-            "certified", "certification", "certificate", "accredited", "credential",
-            "aws", "azure", "google cloud", "gcp", "cisco", "microsoft", "oracle",
-            "pmp", "scrum master", "cissp", "ceh", "comptia", "itil"
-        ]
+        self.certification_keywords = CERTIFICATION_KEYWORDS
         
         # Project section keywords
         self.project_keywords = [
@@ -73,16 +122,21 @@ class ResumeParser:
         ]
         
         # Internship/Experience keywords
-        self.experience_keywords = [
-            "intern", "internship", "trainee", "co-op", "work experience",
-            "employment", "position", "role", "job", "worked at", "working at"
-        ]
+        self.experience_keywords = EXPERIENCE_KEYWORDS
+    
+    async def parse_file(self, file_content: Union[bytes, BinaryIO], filename: str) -> Dict[str, Any]:
+        """Parse resume file (raw bytes or a seekable binary file) and extract structured data.
+
+        Text extraction and the regex passes are CPU-bound, so they run in a worker thread
+        instead of stalling the event loop for every other request.
+        """
+        return await asyncio.to_thread(self._parse, file_content, filename)
     
-    async def parse_file(self, file_content: bytes, filename: str) -> Dict[str, Any]:
-        """Parse resume file and extract structured data."""
+    def _parse(self, file_content: Union[bytes, BinaryIO], filename: str) -> Dict[str, Any]:
+        """Synchronous body of parse_file."""
         try:
             # Determine file type and extract text
-            text = await self._extract_text(file_content, filename)
+            text = self._extract_text(file_content, filename)
             
             if not text.strip():
                 return {
@@ -124,7 +178,7 @@ class ResumeParser:
                 "parsed": {}
             }
     
-    async def _extract_text(self, file_content: bytes, filename: str) -> str:
+    def _extract_text(self, file_content: Union[bytes, BinaryIO], filename: str) -> str:
         """Extract text from PDF or DOCX file."""
         file_ext = filename.lower().split('.')[-1] if '.' in filename else ''
         
@@ -135,18 +189,33 @@ class ResumeParser:
                 return self._extract_docx_text(file_content)
             else:
                 # Fallback: try to decode as plain text
-                return file_content.decode('utf-8', errors='ignore')
+                return self._read_bytes(file_content).decode('utf-8', errors='ignore')
         except Exception as e:
             logger.warning(f"Failed to extract text from {filename}: {e}")
             # Last resort: decode as text
-            return file_content.decode('utf-8', errors='ignore')
+            return self._read_bytes(file_content).decode('utf-8', errors='ignore')
     
-    def _extract_pdf_text(self, file_content: bytes) -> str:
+    @staticmethod
+    def _as_stream(file_content: Union[bytes, BinaryIO]) -> BinaryIO:
+        """Return a binary stream positioned at the start of the file."""
+        if isinstance(file_content, (bytes, bytearray)):
+            return io.BytesIO(file_content)
+        file_content.seek(0)
+        return file_content
+    
+    @classmethod
+    def _read_bytes(cls, file_content: Union[bytes, BinaryIO]) -> bytes:
+        """Return the whole file as bytes."""
+        if isinstance(file_content, (bytes, bytearray)):
+            return bytes(file_content)
+        return cls._as_stream(file_content).read()
+    
+    def _extract_pdf_text(self, file_content: Union[bytes, BinaryIO]) -> str:
         """Extract text from PDF using PyPDF2."""
         if not PDF_AVAILABLE:
             raise ImportError("PyPDF2 not available for PDF parsing")
             
-        pdf_reader = PyPDF2.PdfReader(io.BytesIO(file_content))
+        pdf_reader = PyPDF2.PdfReader(self._as_stream(file_content))
         text = ""
         
         for page in pdf_reader.pages:
@@ -158,12 +227,12 @@ class ResumeParser:
                 
         return text
     
-    def _extract_docx_text(self, file_content: bytes) -> str:
+    def _extract_docx_text(self, file_content: Union[bytes, BinaryIO]) -> str:
         """Extract text from DOCX using python-docx."""
         if not DOCX_AVAILABLE:
             raise ImportError("python-docx not available for DOCX parsing")
             
-        doc = Document(io.BytesIO(file_content))
+        doc = Document(self._as_stream(file_content))
         text = ""
         
         for paragraph in doc.paragraphs:
@@ -248,7 +317,7 @@ class ResumeParser:
                 continue
             
             # Check if line contains education keywords
-            has_education_keyword = any(keyword in line_lower for keyword in self.education_keywords)
+            has_education_keyword = _EDUCATION_KEYWORD_PATTERN.search(line_lower) is not None
             
             if has_education_keyword or in_education_section:
                 # Extract year (more flexible pattern)
@@ -290,7 +359,6 @@ class ResumeParser:
     def _extract_skills(self, text: str) -> List[str]:
         """Extract skills from resume text using keyword matching with improved accuracy."""
         text_lower = text.lower()
-        found_skills = set()
         
         # Look for dedicated skills section first (more accurate)
         skills_section_match = re.search(
@@ -304,30 +372,14 @@ class ResumeParser:
             # Prioritize skills section content
             search_text = skills_section_match.group(1) + "\n" + text_lower
         
-        # Tokenize text for better matching
-        # Split on common separators while preserving multi-word skills
-        tokens = re.findall(r'\b[\w\+\-\.#]+(?:\s+[\w\+\-\.#]+)?\b', search_text)
-        token_set = set(tok.lower() for tok in tokens)
-        
-        # Match each skill from our canonical list
-        for skill in self.canonical_skills:
-            skill_lower = skill.lower()
-            
-            # Exact matches in tokens (handles word boundaries better)
-            if skill_lower in token_set:
-                found_skills.add(self._normalize_skill_name(skill))
-                continue
-            
-            # For multi-word skills, check in full text
-            if ' ' in skill_lower or '.' in skill_lower:
-                # Use word boundary regex for better matching
-                pattern = r'\b' + re.escape(skill_lower) + r'\b'
-                if re.search(pattern, search_text):
-                    found_skills.add(self._normalize_skill_name(skill))
-                    continue
+        # Single-token skills by set intersection, multi-word/punctuated ones in one regex pass
+        matches = _SINGLE_TOKEN_SKILLS.intersection(_TOKEN_PATTERN.findall(search_text)).union(
+            _PHRASE_SKILL_PATTERN.findall(search_text)
+        )
+        found_skills = {self._normalize_skill_name(skill) for skill in matches}
         
         # Return sorted unique list (limit to 30 top skills)
-        return sorted(list(found_skills))[:30]
+        return sorted(found_skills)[:30]
     
     def _normalize_skill_name(self, skill: str) -> str:
         """Normalize skill names for consistent display."""
@@ -478,7 +530,7 @@ class ResumeParser:
             line_lower = line.lower().strip()
             
             # Check if line contains certification keywords
-            if any(keyword in line_lower for keyword in self.certification_keywords):
+            if _CERTIFICATION_KEYWORD_PATTERN.search(line_lower):
                 cert_entry = {"raw_text": line.strip()}
                 
                 # Try to extract year
@@ -532,30 +584,17 @@ class ResumeParser:
     
     def _extract_languages(self, text: str) -> List[str]:
         """Extract spoken languages from resume text."""
-        languages = []
-        common_languages = [
-            "english", "hindi", "spanish", "french", "german", "chinese", "mandarin",
-            "japanese", "korean", "arabic", "portuguese", "russian", "italian",
-            "tamil", "telugu", "marathi", "bengali", "gujarati", "kannada", "malayalam"
-        ]
-        
         text_lower = text.lower()
         
         # Look for language section
         lang_section_match = re.search(r'languages?\s*:?\s*(.*?)(?:\n\n|\Z)', text_lower, re.DOTALL)
-        if lang_section_match:
-            lang_text = lang_section_match.group(1)
-            for lang in common_languages:
-                if lang in lang_text:
-                    languages.append(lang.title())
+        languages = _LANGUAGE_PATTERN.findall(lang_section_match.group(1)) if lang_section_match else []
         
         # Also check in full text if no language section found
         if not languages:
-            for lang in common_languages:
-                if lang in text_lower:
-                    languages.append(lang.title())
+            languages = _LANGUAGE_PATTERN.findall(text_lower)
         
-        return list(set(languages))[:5]  # Return max 5 unique languages
+        return [lang.title() for lang in dict.fromkeys(languages)][:5]  # Return max 5 unique languages
     
     def _extract_internships(self, text: str) -> List[Dict[str, str]]:
         """Extract internships/work experience from resume text."""
@@ -594,7 +633,7 @@ class ResumeParser:
                 continue
             
             # Check for experience indicators
-            has_experience_keyword = any(keyword in line_lower for keyword in self.experience_keywords)
+            has_experience_keyword = _EXPERIENCE_KEYWORD_PATTERN.search(line_lower) is not None
             
             # Check for date patterns (common in experience sections)
             date_pattern = r'(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec|present|current|\d{4})'
@@ -0,0 +1,25 @@
+import os
+import sys
+
+import pytest
+
+# Ensure the backend directory is on sys.path so tests can import main.py and the app packages
+CURRENT_DIR = os.path.dirname(__file__)
+BACKEND_ROOT = os.path.abspath(os.path.join(CURRENT_DIR, os.pardir))
+if BACKEND_ROOT not in sys.path:
+    sys.path.insert(0, BACKEND_ROOT)
+
+
+@pytest.fixture(scope="session")
+def client():
+    """TestClient for the whole app, shared by every test."""
+    from fastapi.testclient import TestClient
+    from main import app  # type: ignore
+    return TestClient(app)
+
+
+@pytest.fixture
+def auth_headers():
+    """Bearer header carrying a locally signed token for ``test_user``."""
+    from core.security import create_access_token  # type: ignore
+    return {"Authorization": f"Bearer {create_access_token({'user_id': 'test_user'})}"}
@@ -0,0 +1,56 @@
+import json
+
+import pytest
+
+from api import careers  # type: ignore
+
+
+class FakeScraper:
+    def __init__(self, jobs, fail_after=None):
+        self.jobs = jobs
+        self.fail_after = fail_after
+        self.kwargs = None
+
+    def iter_scrape_jobs(self, **kwargs):
+        self.kwargs = kwargs
+        for i, job in enumerate(self.jobs):
+            if self.fail_after is not None and i == self.fail_after:
+                raise RuntimeError("scraper blocked")
+            yield job
+
+
+@pytest.fixture
+def use_scraper(monkeypatch):
+    def install(scraper):
+        monkeypatch.setattr(careers, "job_scraper_service", scraper)
+        return scraper
+    return install
+
+
+def test_job_stream_writes_one_json_object_per_line(client, auth_headers, use_scraper):
+    jobs = [{"id": "1", "title": "Data Analyst"}, {"id": "2", "title": "ML Engineer", "salary": None}]
+    scraper = use_scraper(FakeScraper(jobs))
+
+    r = client.post("/api/v1/careers/jobs/search/stream", json={"search_term": "data"}, headers=auth_headers)
+
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("application/x-ndjson")
+    assert r.text.endswith("\n")
+    assert [json.loads(line) for line in r.text.splitlines()] == jobs
+    assert scraper.kwargs["search_term"] == "data"
+    assert scraper.kwargs["location"] == "India"
+
+
+def test_job_stream_ends_cleanly_when_scraper_fails(client, auth_headers, use_scraper):
+    jobs = [{"id": "1", "title": "Data Analyst"}, {"id": "2", "title": "ML Engineer"}]
+    use_scraper(FakeScraper(jobs, fail_after=1))
+
+    r = client.post("/api/v1/careers/jobs/search/stream", json={"search_term": "data"}, headers=auth_headers)
+
+    assert r.status_code == 200
+    assert [json.loads(line) for line in r.text.splitlines()] == jobs[:1]
+
+
+def test_job_stream_validates_request(client, auth_headers):
+    r = client.post("/api/v1/careers/jobs/search/stream", json={"search_term": ""}, headers=auth_headers)
+    assert r.status_code == 422
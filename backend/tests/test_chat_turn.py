@@ -0,0 +1,139 @@
+import json
+
+import pytest
+
+from api import chat  # type: ignore
+
+
+class RecordingFirestore:
+    """Just enough of FirestoreService for a chat turn, keeping saved messages in a list."""
+
+    def __init__(self, history=None):
+        self.saved = []
+        self.history = history or []
+
+    async def create_chat_session(self, user_id, title=None):
+        return "session-1"
+
+    async def save_chat_message(self, session_id, user_id, role, content, message_type="text", metadata=None):
+        message_id = f"msg-{len(self.saved)}"
+        self.saved.append({"id": message_id, "session_id": session_id, "user_id": user_id,
+                           "role": role, "content": content, "metadata": metadata or {}})
+        return message_id
+
+    async def get_chat_history(self, session_id, limit=50, user_id=None):
+        return list(self.history)
+
+    async def get_user_profile(self, user_id):
+        return {"skills": ["python"], "experience_years": 2}
+
+
+class FailingGemini:
+    async def generate_chat_response(self, message, chat_history=None, system_prompt=None):
+        raise TimeoutError("generation timed out")
+
+    async def stream_chat_response(self, message, chat_history=None, system_prompt=None):
+        raise TimeoutError("generation timed out")
+        yield  # pragma: no cover
+
+
+class EchoGemini:
+    def __init__(self):
+        self.history = None
+
+    async def generate_chat_response(self, message, chat_history=None, system_prompt=None):
+        self.history = chat_history
+        return {"response": f"echo: {message}", "confidence": 0.9}
+
+    async def stream_chat_response(self, message, chat_history=None, system_prompt=None):
+        self.history = chat_history
+        for part in ("echo: ", message):
+            yield part
+
+
+@pytest.fixture
+def use_services(monkeypatch):
+    """Swap the chat router's Firestore and Gemini services; returns the store for assertions."""
+    def install(store, gemini):
+        monkeypatch.setattr(chat, "firestore_service", store)
+        monkeypatch.setattr(chat, "gemini_service", gemini)
+        return store
+    return install
+
+
+def test_user_message_saved_when_generation_fails(client, auth_headers, use_services):
+    store = use_services(RecordingFirestore(), FailingGemini())
+
+    r = client.post("/api/v1/chat/message", json={"message": "Which career suits me?"}, headers=auth_headers)
+
+    assert r.status_code == 500
+    assert [(m["role"], m["content"]) for m in store.saved] == [("user", "Which career suits me?")]
+
+
+def test_stream_saves_user_message_when_generation_fails(client, auth_headers, use_services):
+    store = use_services(RecordingFirestore(), FailingGemini())
+
+    r = client.post("/api/v1/chat/message/stream", json={"message": "Hi"}, headers=auth_headers)
+
+    assert r.status_code == 200
+    assert r.text.startswith("event: error\ndata: ")
+    assert [(m["role"], m["content"]) for m in store.saved] == [("user", "Hi")]
+
+
+def test_send_message_saves_both_turns_and_excludes_new_message_from_history(client, auth_headers, use_services):
+    # The history read races the user-message write; simulate it having seen the write
+    gemini = EchoGemini()
+    store = use_services(RecordingFirestore(history=[{"id": "msg-0", "role": "user", "content": "Hello"}]), gemini)
+
+    r = client.post("/api/v1/chat/message", json={"message": "Hello"}, headers=auth_headers)
+
+    assert r.status_code == 200
+    body = r.json()
+    assert body["message"]["content"] == "echo: Hello"
+    assert body["message"]["id"] == "msg-1"
+    assert [m["role"] for m in store.saved] == ["user", "assistant"]
+    assert gemini.history == []
+
+
+def test_suggestions_tolerate_legacy_profile_shapes():
+    legacy = {
+        "skills": [{"name": "python"}],
+        "experience_years": ["2"],
+        "field_of_study": {"major": "CS"},
+    }
+    assert chat._generate_suggestions("what career fits me", legacy)
+    assert chat._generate_suggestions("salary", {"skills": "python", "experience_years": "3"})
+
+
+def test_trim_history_keeps_newest_message_when_over_budget():
+    history = [
+        {"role": "user", "content": "short question"},
+        {"role": "assistant", "content": "x" * 50},
+    ]
+    trimmed = chat._trim_history(history, max_chars=20)
+    assert trimmed == [{"role": "assistant", "content": "x" * 20}]
+    assert history[1]["content"] == "x" * 50
+
+    assert chat._trim_history(history, max_chars=60) == history[1:]
+    assert chat._trim_history(history, max_chars=100) == history
+    assert chat._trim_history([]) == []
+
+
+def test_stream_frames_chunks_then_done_event(client, auth_headers, use_services):
+    store = use_services(RecordingFirestore(), EchoGemini())
+
+    r = client.post("/api/v1/chat/message/stream", json={"message": "career"}, headers=auth_headers)
+
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/event-stream")
+    events = r.text.split("\n\n")
+    assert events[-1] == ""
+    assert events[0] == 'data: {"text":"echo: "}'
+    assert events[1] == 'data: {"text":"career"}'
+    name, data = events[2].split("\n")
+    assert name == "event: done"
+    done = json.loads(data.removeprefix("data: "))
+    assert done["session_id"] == "session-1"
+    assert done["message_id"] == "msg-1"
+    assert done["suggestions"]
+    assert [(m["role"], m["content"]) for m in store.saved] == [("user", "career"), ("assistant", "echo: career")]
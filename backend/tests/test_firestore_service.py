@@ -0,0 +1,97 @@
+import asyncio
+
+from services.firestore_service import FirestoreService  # type: ignore
+
+
+class RecordingDB:
+    """Firestore client stand-in that records batch operations and commits."""
+
+    def __init__(self):
+        self.ops = []
+
+    def collection(self, name):
+        return _Collection(name)
+
+    def batch(self):
+        return _Batch(self.ops)
+
+
+class _Collection:
+    def __init__(self, name):
+        self.name = name
+
+    def document(self, doc_id):
+        return f"{self.name}/{doc_id}"
+
+
+class _Batch:
+    def __init__(self, ops):
+        self.ops = ops
+
+    def set(self, ref, data):
+        self.ops.append(("set", ref))
+
+    def update(self, ref, data):
+        self.ops.append(("update", ref))
+
+    def commit(self):
+        self.ops.append(("commit",))
+
+
+def test_save_chat_message_writes_message_and_session_in_one_commit():
+    service = FirestoreService()
+    service.db = RecordingDB()
+
+    message_id = asyncio.run(service.save_chat_message("session-1", "user-1", "user", "Hello"))
+
+    assert service.db.ops == [
+        ("set", f"chat_messages/{message_id}"),
+        ("update", "chat_sessions/session-1"),
+        ("commit",),
+    ]
+
+
+def test_update_and_return_profile_does_not_cache_the_local_merge(monkeypatch):
+    from services import firestore_service
+
+    class ProfileDB(RecordingDB):
+        def __init__(self):
+            super().__init__()
+            self.reads = 0
+            self.doc = {"user_id": "user-1", "skills": ["Python"]}
+
+        def collection(self, name):
+            return _ProfileCollection(self)
+
+    class _ProfileCollection:
+        def __init__(self, db):
+            self.db = db
+
+        def document(self, doc_id):
+            return _ProfileDoc(self.db)
+
+    class _ProfileDoc:
+        def __init__(self, db):
+            self.db = db
+
+        def get(self):
+            self.db.reads += 1
+            doc = dict(self.db.doc)
+            return type("Snapshot", (), {"exists": True, "to_dict": lambda _: dict(doc)})()
+
+        def set(self, data, merge=False):
+            self.db.doc.update(data)
+
+    monkeypatch.setattr(firestore_service.settings, "PROFILE_CACHE_TTL_SECONDS", 300)
+    monkeypatch.setattr(firestore_service, "_profile_cache", {})
+    service = FirestoreService()
+    service.db = ProfileDB()
+
+    merged = asyncio.run(service.update_and_return_profile("user-1", {"location": "Pune"}))
+    assert merged["location"] == "Pune" and merged["skills"] == ["Python"]
+    assert "user-1" not in firestore_service._profile_cache
+
+    # Another worker's write is visible on the next read instead of being masked
+    service.db.doc["skills"] = ["Go"]
+    assert asyncio.run(service.get_user_profile("user-1"))["skills"] == ["Go"]
+    assert service.db.reads == 2
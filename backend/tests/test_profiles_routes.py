@@ -0,0 +1,114 @@
+import warnings
+from datetime import datetime, timedelta
+
+import pytest
+
+from api import profiles  # type: ignore
+from agents.base_agent import orchestrator  # type: ignore
+
+
+class ProfileStore:
+    """Serves one fixed profile and the parsed resumes stored under it."""
+
+    def __init__(self, profile, resumes=None):
+        self.profile = profile
+        self.resumes = resumes or {}
+
+    async def get_user_profile(self, user_id):
+        return self.profile
+
+    async def get_resume_parsed(self, user_id, resume_id):
+        return self.resumes.get(resume_id)
+
+
+@pytest.fixture
+def use_store(monkeypatch):
+    def install(store):
+        monkeypatch.setattr(profiles, "firestore_service", store)
+        return store
+    return install
+
+
+@pytest.fixture
+def no_agents(monkeypatch):
+    # Force the static fallback responses
+    monkeypatch.setattr(orchestrator, "agents", {})
+
+
+def test_fallback_skill_gap_etag_and_304(client, auth_headers, use_store, no_agents):
+    use_store(ProfileStore({"skills": ["Python"]}))
+    url = "/api/v1/profiles/skill-gap-analysis"
+
+    r = client.get(url, headers=auth_headers)
+    assert r.status_code == 200
+    etag = r.headers["etag"]
+    assert etag.startswith('"') and etag.endswith('"')
+    assert r.json()
+
+    r = client.get(url, headers={**auth_headers, "If-None-Match": etag})
+    assert r.status_code == 304
+    assert r.headers["etag"] == etag
+    assert r.content == b""
+
+    # Weak validators and lists of tags match too; a stale tag gets the full body
+    assert client.get(url, headers={**auth_headers, "If-None-Match": f'"old", W/{etag}'}).status_code == 304
+    assert client.get(url, headers={**auth_headers, "If-None-Match": '"old"'}).status_code == 200
+
+
+def test_fallback_learning_resources_etag_and_304(client, auth_headers, use_store, no_agents):
+    use_store(ProfileStore({"skills": ["Python"]}))
+
+    r = client.get("/api/v1/profiles/learning-resources", headers=auth_headers)
+    assert r.status_code == 200
+    etag = r.headers["etag"]
+    assert etag != client.get("/api/v1/profiles/skill-gap-analysis", headers=auth_headers).headers["etag"]
+
+    r = client.get("/api/v1/profiles/learning-resources", headers={**auth_headers, "If-None-Match": etag})
+    assert r.status_code == 304
+
+
+def test_parsed_resume_from_subcollection(client, auth_headers, use_store):
+    parsed = {"skills": ["Python", "SQL"], "name": "Asha"}
+    use_store(ProfileStore({"resume": {"resume_id": "abc123", "filename": "cv.pdf"}}, {"abc123": parsed}))
+
+    for path in ("/api/v1/profiles/resume/parsed", "/api/resume"):
+        r = client.get(path, headers=auth_headers)
+        assert r.status_code == 200
+        assert r.json() == {"resume_id": "abc123", "parsed_data": parsed}
+
+
+def test_parsed_resume_inline_on_older_profiles(client, auth_headers, use_store):
+    use_store(ProfileStore({"resume": {"filename": "cv.pdf", "parsed_data": {"skills": ["Java"]}}}))
+
+    r = client.get("/api/v1/profiles/resume/parsed", headers=auth_headers)
+    assert r.status_code == 200
+    assert r.json() == {"resume_id": None, "parsed_data": {"skills": ["Java"]}}
+
+
+def test_parsed_resume_404_without_resume(client, auth_headers, use_store):
+    use_store(ProfileStore({"skills": []}))
+
+    assert client.get("/api/v1/profiles/resume/parsed", headers=auth_headers).status_code == 404
+    assert client.get("/api/resume", headers=auth_headers).status_code == 404
+
+
+def test_create_profile_fallback_returns_validated_items_and_utc_timestamps(client, auth_headers, use_store, no_agents):
+    class SavingStore(ProfileStore):
+        async def save_user_profile(self, user_id, profile_data):
+            self.profile = profile_data
+            return user_id
+
+    store = use_store(SavingStore(None))
+    body = {"skills": ["Python"], "certifications": [{"name": "AWS", "issuer": "Amazon"}], "projects": [{"name": "Bot"}]}
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        r = client.post("/api/v1/profiles/", json=body, headers=auth_headers)
+
+    assert r.status_code == 200
+    data = r.json()
+    assert data["user_id"] == "test_user"
+    assert data["certifications"] == [{"name": "AWS", "issuer": "Amazon", "year": None, "url": None}]
+    assert data["projects"][0]["name"] == "Bot"
+    assert datetime.fromisoformat(data["created_at"].replace("Z", "+00:00")).utcoffset() == timedelta(0)
+    assert store.profile["skills"] == ["Python"]
@@ -0,0 +1,24 @@
+from data.domains_roadmap import DOMAINS_ROADMAP, get_related  # type: ignore
+
+
+def test_related_roadmaps_cover_both_directions(client):
+    domain_id = "data-science"
+    r = client.get(f"/api/v1/roadmaps/{domain_id}/related")
+    assert r.status_code == 200
+    roadmaps = r.json()
+    ids = [roadmap["domain_id"] for roadmap in roadmaps]
+
+    expected = set(DOMAINS_ROADMAP[domain_id]["related_domains"]) | set(get_related(domain_id))
+    expected = {slug for slug in expected if slug in DOMAINS_ROADMAP and slug != domain_id}
+    assert set(ids) == expected
+    assert len(ids) == len(set(ids))
+    # The domain's own related_domains come first, in their listed order
+    own = [slug for slug in DOMAINS_ROADMAP[domain_id]["related_domains"] if slug in DOMAINS_ROADMAP]
+    assert ids[:len(own)] == own
+    assert all({"title", "learning_path"} <= roadmap.keys() for roadmap in roadmaps)
+
+
+def test_related_roadmaps_unknown_domain_404(client):
+    r = client.get("/api/v1/roadmaps/not-a-domain/related")
+    assert r.status_code == 404
+    assert r.json()["detail"] == "Roadmap not found"
@@ -0,0 +1,137 @@
+from types import SimpleNamespace
+
+import bcrypt
+import pytest
+from fastapi import HTTPException
+
+from core import security  # type: ignore
+from core.config import settings  # type: ignore
+
+
+@pytest.fixture
+def token_caches(monkeypatch):
+    """Empty verify_token caches, local JWT only (Firebase is patched in where a test needs it)."""
+    monkeypatch.setattr(security, "firebase_auth", None)
+    security._token_cache.clear()
+    security._rejected_tokens.clear()
+    yield
+    security._token_cache.clear()
+    security._rejected_tokens.clear()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable time.time() for the cache TTLs."""
+    now = SimpleNamespace(value=1_000_000.0)
+    monkeypatch.setattr(security, "time", SimpleNamespace(time=lambda: now.value))
+    return now
+
+
+@pytest.fixture
+def decode_calls(monkeypatch):
+    """Count the JWT signature checks verify_token actually performs."""
+    calls = []
+    real_decode = security.jwt.decode
+
+    def counting_decode(*args, **kwargs):
+        calls.append(1)
+        return real_decode(*args, **kwargs)
+
+    monkeypatch.setattr(security.jwt, "decode", counting_decode)
+    return calls
+
+
+def test_password_hash_roundtrip():
+    hashed = security.get_password_hash("s3cret-pass")
+    assert hashed.startswith("$2b$12$")
+    assert security.verify_password("s3cret-pass", hashed)
+    assert not security.verify_password("wrong-pass", hashed)
+
+
+def test_password_hash_truncates_to_72_bytes():
+    hashed = security.get_password_hash("p" * 72 + "tail")
+    # Only the first 72 bytes count, as with passlib
+    assert security.verify_password("p" * 72, hashed)
+    assert security.verify_password("p" * 72 + "other", hashed)
+    assert not security.verify_password("p" * 71, hashed)
+
+
+def test_verify_password_accepts_existing_hashes_and_rejects_non_bcrypt():
+    legacy = bcrypt.hashpw(b"legacy", bcrypt.gensalt(rounds=4)).decode()
+    assert security.verify_password("legacy", legacy)
+    assert not security.verify_password("legacy", "not-a-bcrypt-hash")
+
+
+def test_verified_token_is_served_from_cache(token_caches, clock, decode_calls):
+    token = security.create_access_token({"user_id": "u1"})
+    assert security.verify_token(token)["user_id"] == "u1"
+
+    payload = security.verify_token(token)
+    assert payload["user_id"] == "u1"
+    assert decode_calls == [1]
+    # Callers get their own copy
+    payload["user_id"] = "mutated"
+    assert security.verify_token(token)["user_id"] == "u1"
+
+
+def test_token_cache_entry_expires_after_ttl(monkeypatch, token_caches, clock, decode_calls):
+    monkeypatch.setattr(settings, "JWT_CACHE_TTL", 60)
+    token = security.create_access_token({"user_id": "u1"})
+    security.verify_token(token)
+
+    clock.value += 59
+    security.verify_token(token)
+    assert decode_calls == [1]
+
+    clock.value += 2
+    assert security.verify_token(token)["user_id"] == "u1"
+    assert decode_calls == [1, 1]
+
+
+def test_rejected_token_is_refused_without_decoding_until_ttl(monkeypatch, token_caches, clock, decode_calls):
+    monkeypatch.setattr(settings, "JWT_REJECT_CACHE_TTL", 5)
+
+    with pytest.raises(HTTPException) as exc:
+        security.verify_token("not-a-jwt")
+    assert exc.value.status_code == 401
+    assert decode_calls == [1]
+
+    clock.value += 4
+    with pytest.raises(HTTPException):
+        security.verify_token("not-a-jwt")
+    assert decode_calls == [1]
+
+    clock.value += 2
+    with pytest.raises(HTTPException):
+        security.verify_token("not-a-jwt")
+    assert decode_calls == [1, 1]
+
+
+def test_rejection_cache_disabled_with_zero_ttl(monkeypatch, token_caches):
+    monkeypatch.setattr(settings, "JWT_REJECT_CACHE_TTL", 0)
+    with pytest.raises(HTTPException):
+        security.verify_token("not-a-jwt")
+    assert not security._rejected_tokens
+
+
+def test_only_definitive_firebase_rejections_are_cached(monkeypatch, token_caches):
+    from firebase_admin import auth as firebase_auth
+
+    class FirebaseRaising:
+        InvalidIdTokenError = firebase_auth.InvalidIdTokenError
+
+        def __init__(self, error):
+            self.error = error
+
+        def verify_id_token(self, token):
+            raise self.error
+
+    monkeypatch.setattr(security, "firebase_auth", FirebaseRaising(firebase_auth.CertificateFetchError("down", None)))
+    with pytest.raises(HTTPException):
+        security.verify_token("firebase-id-token")
+    assert not security._rejected_tokens
+
+    monkeypatch.setattr(security, "firebase_auth", FirebaseRaising(firebase_auth.ExpiredIdTokenError("expired", None)))
+    with pytest.raises(HTTPException):
+        security.verify_token("firebase-id-token")
+    assert len(security._rejected_tokens) == 1
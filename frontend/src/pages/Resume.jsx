@@ -3,6 +3,7 @@ import Navbar from '../components/Navbar';
 import { useAuth } from '../contexts/AuthContext';
 import { useData } from '../contexts/DataContext';
 import toast from 'react-hot-toast';
+import { profileAPI } from '../services/api';
 
 const Resume = () => {
   const { user } = useAuth();
@@ -44,7 +45,13 @@ const Resume = () => {
         });
         
         setResumeData(profileData.resume);
-        setParsedFields(profileData.resume.parsed || profileData.resume.parsed_data || {});
+        const parsed = profileData.resume.parsed || profileData.resume.parsed_data;
+        if (parsed) {
+          setParsedFields(parsed);
+        } else if (profileData.resume.resume_id) {
+          const res = await profileAPI.fetchParsedResume();
+          setParsedFields(res?.data?.parsed_data || {});
+        }
       } else {
         console.log('📄 No resume data in profile');
       }
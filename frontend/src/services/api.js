@@ -141,6 +141,8 @@ export const profileAPI = {
     formData.append('file', file);
     return api.post('/api/resume', formData, { headers: { 'Content-Type': 'multipart/form-data' }, timeout: 60000 });
   },
+  // Parsed resume data is stored apart from the profile; returns { resume_id, parsed_data }
+  fetchParsedResume: () => api.get('/api/resume').catch((error) => { throw error; }),
 };
 
 // Analytics API